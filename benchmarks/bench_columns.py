@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compares parsing every statement column with reading only the used ones.
+
+For each synthetic statement, builds the processor's data frame the way
+it was built before (all columns, types inferred) and with the column
+schemas of the processors (COLUMNS, explicit dtypes), and reports the
+parse time, the peak memory traced during the parse and the size of the
+resulting frame.
+
+    python benchmarks/bench_columns.py --rows 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+import processor_privat  # noqa: E402
+import processor_raif  # noqa: E402
+from bench_pipeline import statement_path  # noqa: E402
+from columnar import frame_with_header  # noqa: E402
+from workbook import Workbook  # noqa: E402
+
+PROCESSORS = {"privat": processor_privat, "raif": processor_raif}
+
+
+def _header_idx(raw, processor):
+    if processor is processor_privat:
+        return processor.HEADER_ROW
+    return raw.index[raw.iloc[:, 0] == processor.HEADER_NAME][0]
+
+
+def all_columns(path, processor):
+    """
+    The previous parse: the whole sheet with inferred types.
+    """
+    raw = pd.read_excel(path, header=None)
+    return frame_with_header(raw, _header_idx(raw, processor))
+
+
+def used_columns(path, processor):
+    """
+    The parse iter_records() does now.
+    """
+    workbook = Workbook(path)
+    if processor is processor_privat:
+        return workbook.frame(processor.HEADER_ROW, processor.COLUMNS)
+    header_idx = _header_idx(workbook.sheet, processor)
+    return workbook.frame(header_idx, processor.COLUMNS)
+
+
+def measure(function, path, processor, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(path, processor)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    # Memory is traced in a separate run, as tracing slows the parse down
+    tracemalloc.start()
+    try:
+        df = function(path, processor)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak, int(df.memory_usage(deep=True).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--layouts", default=",".join(sorted(PROCESSORS)))
+    parser.add_argument("--formats", default="xlsx,xls")
+    parser.add_argument("--runs", type=int, default=3, help="Best of this many runs")
+    parser.add_argument("--data-dir", default=os.path.join(HERE, "data"))
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    mb = 1024 * 1024
+    print(f"{'case':<22}{'columns':<9}{'seconds':>9}{'peak MB':>9}{'frame MB':>10}")
+    for layout in args.layouts.split(","):
+        for fmt in args.formats.split(","):
+            path = statement_path(args.data_dir, layout, fmt, args.rows)
+            for label, function in (("all", all_columns), ("used", used_columns)):
+                seconds, peak, size = measure(
+                    function, path, PROCESSORS[layout], args.runs
+                )
+                print(
+                    f"{layout + '-' + fmt + '-' + str(args.rows):<22}{label:<9}"
+                    f"{seconds:>9.2f}{peak / mb:>9.1f}{size / mb:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
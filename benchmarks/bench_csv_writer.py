@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Compares CSV writers on synthetic records.
+
+Measures the previous per-dict csv.DictWriter loop against write_csv and
+write_rows, and checks that all of them write byte-identical files.
+
+    python benchmarks/bench_csv_writer.py --rows 1000000
+"""
+
+import argparse
+import csv
+import filecmp
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import islice
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from output import CHUNK_SIZE, write_csv, write_rows  # noqa: E402
+
+
+def dict_writer(records, output_file, chunk_size=CHUNK_SIZE):
+    """
+    The DictWriter based write_csv this benchmark compares against.
+    """
+    with open(output_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Date", "Details", "Sum"])
+        writer.writeheader()
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            f.flush()
+
+
+def make_records(rows, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "Date": f"2024/{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}",
+            "Details": f"Merchant, #{i} <Category> 12:{i % 60:02d}:00 "
+            f"({rng.uniform(1, 500):.2f} USD @ 41.25)",
+            "Sum": f"{rng.uniform(-5000, 5000):.2f}",
+        }
+        for i in range(rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=3, help="Best of this many runs")
+    args = parser.parse_args()
+
+    records = make_records(args.rows)
+    rows = [(rec["Date"], rec["Details"], rec["Sum"]) for rec in records]
+    cases = {
+        "DictWriter (previous)": lambda path: dict_writer(records, path),
+        "write_csv (dicts)": lambda path: write_csv(records, path),
+        "write_rows (tuples)": lambda path: write_rows(rows, path),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        best = {}
+        for name, write in cases.items():
+            path = os.path.join(tmp, f"{len(paths)}.csv")
+            paths[name] = path
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                write(path)
+                elapsed = time.perf_counter() - start
+                best[name] = min(best.get(name, elapsed), elapsed)
+
+        reference = paths["DictWriter (previous)"]
+        base = best["DictWriter (previous)"]
+        print(f"{'writer':<24}{'seconds':>9}{'rows/s':>12}{'speed-up':>10}  identical")
+        for name, seconds in best.items():
+            identical = filecmp.cmp(reference, paths[name], shallow=False)
+            print(
+                f"{name:<24}{seconds:>9.2f}{args.rows / seconds:>12.0f}"
+                f"{base / seconds:>9.2f}x  {'yes' if identical else 'NO'}"
+            )
+            if not identical:
+                sys.exit(f"{name} output differs from DictWriter")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Compares the float and the integer minor-unit amount paths end to end.
+
+Runs detection, the processor and write_csv on synthetic statements with
+this tree and with the processors as they were while amounts were floats
+(a temporary git worktree of --float-rev), each in a fresh interpreter.
+Reports the process and write times of both and counts the output lines
+on which they differ, such as FX rates that float division rounded the
+wrong way. Statements are generated once into benchmarks/data/.
+
+    python benchmarks/bench_money.py --rows 50000
+    python benchmarks/bench_money.py --rows 1000000 --format xlsx
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# The last revision whose processors carried amounts as floats
+FLOAT_REV = "9a4d930^"
+
+
+def run_case(root, path, output_file, runs):
+    """
+    Converts one statement with the modules under root and returns the
+    best process and write_csv times.
+    """
+    sys.path.insert(0, root)
+    from output import write_csv
+    from registry import load_processor
+    from structure_detector import detect_structure
+    from workbook import Workbook
+
+    result = {"process": None, "write_csv": None}
+    for _ in range(runs):
+        workbook = Workbook(path)
+        processor = load_processor(detect_structure(workbook))
+
+        start = time.perf_counter()
+        records = list(processor.iter_records(workbook))
+        process = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_csv(records, output_file)
+        write = time.perf_counter() - start
+
+        for stage, seconds in (("process", process), ("write_csv", write)):
+            if result[stage] is None or seconds < result[stage]:
+                result[stage] = seconds
+    result["rows"] = len(records)
+    return result
+
+
+def measure(root, path, output_file, runs):
+    command = [sys.executable, __file__, "--run-case", path]
+    command += ["--root", root, "--output", output_file, "--runs", str(runs)]
+    output = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def differing_lines(path_a, path_b):
+    with open(path_a, encoding="utf-8") as a, open(path_b, encoding="utf-8") as b:
+        return sum(line_a != line_b for line_a, line_b in zip(a, b))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--layouts", default="privat,raif")
+    parser.add_argument("--format", default="xls", choices=("xls", "xlsx"))
+    parser.add_argument("--runs", type=int, default=3, help="Best of this many runs")
+    parser.add_argument("--float-rev", default=FLOAT_REV)
+    parser.add_argument("--data-dir", default=os.path.join(HERE, "data"))
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.root, args.run_case, args.output, args.runs)))
+        return
+
+    from bench_pipeline import statement_path
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="bench_money-") as tmp:
+        float_root = os.path.join(tmp, "float")
+        subprocess.run(
+            ["git", "-C", ROOT, "worktree", "add", "--detach", float_root]
+            + [args.float_rev],
+            capture_output=True,
+            check=True,
+        )
+        try:
+            print(
+                f"{'case':<22}{'path':<13}{'process s':>11}{'write s':>9}"
+                f"{'total s':>9}{'rows/s':>11}"
+            )
+            for layout in args.layouts.split(","):
+                path = statement_path(args.data_dir, layout, args.format, args.rows)
+                key = f"{layout}-{args.format}-{args.rows}"
+                outputs = []
+                for name, root in (("float", float_root), ("minor units", ROOT)):
+                    output_file = os.path.join(tmp, f"{key}-{len(outputs)}.csv")
+                    result = measure(root, path, output_file, args.runs)
+                    total = result["process"] + result["write_csv"]
+                    print(
+                        f"{key:<22}{name:<13}{result['process']:>11.2f}"
+                        f"{result['write_csv']:>9.2f}{total:>9.2f}"
+                        f"{result['rows'] / total:>11.0f}"
+                    )
+                    outputs.append(output_file)
+                print(f"{key:<22}lines that differ: {differing_lines(*outputs)}")
+        finally:
+            subprocess.run(
+                ["git", "-C", ROOT, "worktree", "remove", "--force", float_root],
+                capture_output=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
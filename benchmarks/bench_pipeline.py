@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmarks detection, the processors and write_csv on synthetic statements.
+
+Each case runs in a fresh interpreter so that peak RSS belongs to that
+case alone. Statements are generated once into benchmarks/data/.
+
+    python benchmarks/bench_pipeline.py --sizes 1000,10000,100000
+    python benchmarks/bench_pipeline.py --save-baseline
+    python benchmarks/bench_pipeline.py --compare --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from generate import LAYOUTS, XLS_MAX_ROWS, generate  # noqa: E402
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+STAGES = ("detect", "process", "write_csv")
+
+
+def run_case(path, stream):
+    """
+    Runs the pipeline stages on one statement and returns the measurements.
+    """
+    import resource
+
+    from output import write_csv
+    from registry import load_processor
+    from structure_detector import detect_structure
+    from workbook import Workbook
+
+    result = {}
+
+    start = time.perf_counter()
+    workbook = Workbook(path, streaming=stream)
+    structure = detect_structure(workbook)
+    result["detect"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    processor = load_processor(structure)
+    records = list(
+        processor.stream(workbook) if stream else processor.iter_records(workbook)
+    )
+    result["process"] = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        write_csv(records, os.path.join(tmp, "out.csv"))
+        result["write_csv"] = time.perf_counter() - start
+
+    result["rows"] = len(records)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    result["peak_rss_mb"] = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return result
+
+
+def statement_path(data_dir, layout, fmt, rows):
+    path = os.path.join(data_dir, f"{layout}-{rows}.{fmt}")
+    if not os.path.exists(path):
+        print(f"Generating {path} ...", file=sys.stderr)
+        generate(layout, rows, path)
+    return path
+
+
+def cases(args):
+    for layout in args.layouts.split(","):
+        for fmt in args.formats.split(","):
+            for rows in (int(size) for size in args.sizes.split(",")):
+                if fmt == "xls" and rows + 4 > XLS_MAX_ROWS:
+                    continue
+                key = f"{layout}-{fmt}-{rows}" + ("-stream" if args.stream else "")
+                yield key, layout, fmt, rows
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns messages for stages slower than baseline by more than tolerance.
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for stage in STAGES:
+            before, now = baseline[key][stage], result[stage]
+            if before > 0 and now > before * (1 + tolerance):
+                regressions.append(
+                    f"{key} {stage}: {now:.3f}s vs baseline {before:.3f}s "
+                    f"(+{(now / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", default=DEFAULT_SIZES, help="Comma-separated row counts"
+    )
+    parser.add_argument("--layouts", default=",".join(sorted(LAYOUTS)))
+    parser.add_argument("--formats", default="xlsx,xls")
+    parser.add_argument(
+        "--stream", action="store_true", help="Use the streaming reader"
+    )
+    parser.add_argument("--data-dir", default=os.path.join(HERE, "data"))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="Fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.stream)))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {}
+    print(
+        f"{'case':<28}{'rows':>9}{'detect ms':>11}{'process s':>11}"
+        f"{'rows/s':>11}{'write s':>9}{'rows/s':>11}{'peak MB':>9}"
+    )
+    for key, layout, fmt, rows in cases(args):
+        try:
+            path = statement_path(args.data_dir, layout, fmt, rows)
+        except ImportError as e:
+            print(f"{key:<28} skipped: {e}")
+            continue
+        command = [sys.executable, __file__, "--run-case", path]
+        if args.stream:
+            command.append("--stream")
+        output = subprocess.run(command, capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        results[key] = result
+        print(
+            f"{key:<28}{result['rows']:>9}{result['detect'] * 1000:>11.1f}"
+            f"{result['process']:>11.2f}{result['rows'] / result['process']:>11.0f}"
+            f"{result['write_csv']:>9.2f}{result['rows'] / result['write_csv']:>11.0f}"
+            f"{result['peak_rss_mb']:>9.0f}"
+        )
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"No baseline at {args.baseline}; run with --save-baseline first")
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
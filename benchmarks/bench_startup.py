@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Measures the cold-start latency of the CLI.
+
+Runs main.py in fresh interpreters for cases that do not convert
+anything (--help, a missing input file) and reports the median wall
+time next to the cost of a bare interpreter and of importing pandas.
+
+    python benchmarks/bench_startup.py --runs 10 --max-ms 300
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CASES = {
+    "python -c pass": [sys.executable, "-c", "pass"],
+    "import pandas": [sys.executable, "-c", "import pandas"],
+    "main.py --help": [sys.executable, "main.py", "--help"],
+    "main.py missing.xlsx": [
+        sys.executable,
+        "main.py",
+        "--no-cache",
+        "missing-input-file.xlsx",
+    ],
+}
+
+# Cases that must stay below --max-ms
+CHECKED_CASES = ("main.py --help", "main.py missing.xlsx")
+
+
+def measure(command, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per case")
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="Fail if a CLI case that converts nothing takes longer (median)",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for name, command in CASES.items():
+        median_ms = measure(command, args.runs)
+        status = ""
+        if args.max_ms is not None and name in CHECKED_CASES:
+            if median_ms > args.max_ms:
+                status = f"  SLOWER than {args.max_ms:g} ms"
+                failed = True
+        print(f"{name:<24} {median_ms:8.1f} ms{status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Generates synthetic Privat and Raiffeisen statements for benchmarks.
+
+    python benchmarks/generate.py privat 100000 /tmp/privat-100k.xlsx
+    python benchmarks/generate.py raif 50000 /tmp/raif-50k.xls
+"""
+
+import argparse
+import datetime
+import os
+import random
+
+PRIVAT_HEADER = [
+    "Дата",
+    "Категорія",
+    "Картка",
+    "Опис операції",
+    "Сума в валюті картки",
+    "Валюта картки",
+    "Сума в валюті транзакції",
+    "Валюта транзакції",
+    "Залишок на кінець періоду",
+    "Валюта залишку",
+]
+
+RAIF_HEADER = [
+    "Дата і час здійснення операції",
+    "Дата обробки операції",
+    "Номер картки",
+    "Деталі операції",
+    "Сума у валюті операції",
+    "Валюта",
+    "Сума у валюті рахунку",
+    "Сума кешбеку",
+    "Залишок",
+]
+
+# The legacy .xls format cannot hold more rows than this
+XLS_MAX_ROWS = 65536
+
+_CATEGORIES = ["Продукти", "Кафе та ресторани", "Транспорт", "Подорожі", "Інше"]
+_MERCHANTS = ["Сільпо", "АТБ", "Uber", "Booking.com", "Rozetka", "Steam", "Аптека"]
+_RAIF_TYPES = ["Покупка", "Оплата послуг", "Переказ коштів", "Повернення"]
+_RAIF_TYPES += ["Поповнення", "Кешбек"]
+_CURRENCIES = ["UAH"] * 8 + ["USD", "EUR"]
+_RATES = {"UAH": 1.0, "USD": 41.25, "EUR": 44.8}
+
+
+def _transactions(rows, seed):
+    rng = random.Random(seed)
+    start = datetime.datetime(2020, 1, 1)
+    for i in range(rows):
+        moment = start + datetime.timedelta(seconds=rng.randrange(5 * 365 * 86400))
+        currency = rng.choice(_CURRENCIES)
+        amount = round(rng.uniform(1, 5000), 2)
+        card_amount = round(amount * _RATES[currency], 2)
+        yield i, rng, moment, currency, amount, card_amount
+
+
+def privat_rows(rows, seed=0):
+    """
+    Yields the rows of a Privat statement with the given number of transactions.
+    """
+    yield ["Виписка з Ваших карток за період 01.01.2020 - 31.12.2024"]
+    yield PRIVAT_HEADER
+    for i, rng, moment, currency, amount, card_amount in _transactions(rows, seed):
+        yield [
+            moment.strftime("%d.%m.%Y %H:%M:%S"),
+            rng.choice(_CATEGORIES),
+            "5168 **** **** 1234",
+            f"{rng.choice(_MERCHANTS)} #{i}",
+            -card_amount,
+            "UAH",
+            -amount,
+            currency,
+            round(rng.uniform(0, 100000), 2),
+            "UAH",
+        ]
+
+
+def raif_rows(rows, seed=0):
+    """
+    Yields the rows of a Raiffeisen statement with the given number of transactions.
+    """
+    yield ["АТ «Райффайзен Банк»"]
+    yield ["Виписка по рахунку UA000000000000000000000000000"]
+    yield ["Період: 01.01.2020 - 31.12.2024"]
+    yield RAIF_HEADER
+    for i, rng, moment, currency, amount, card_amount in _transactions(rows, seed):
+        yield [
+            moment.strftime("%m/%d/%Y %H:%M:%S"),
+            moment.strftime("%m/%d/%Y"),
+            "4149 **** **** 5678",
+            f"{rng.choice(_RAIF_TYPES)}: {rng.choice(_MERCHANTS)} #{i}",
+            amount,
+            currency,
+            card_amount,
+            round(card_amount * 0.01, 2) if rng.random() < 0.2 else 0,
+            round(rng.uniform(0, 100000), 2),
+        ]
+
+
+LAYOUTS = {"privat": privat_rows, "raif": raif_rows}
+
+
+def generate(layout, rows, path, seed=0):
+    """
+    Writes a synthetic statement in the given layout to path;
+    the file type (.xls or .xlsx) follows the extension.
+    """
+    data = LAYOUTS[layout](rows, seed)
+    if os.path.splitext(path)[1].lower() == ".xls":
+        _write_xls(data, path)
+    else:
+        _write_xlsx(data, path)
+
+
+def _write_xlsx(data, path):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    for row in data:
+        ws.append(row)
+    wb.save(path)
+
+
+def _write_xls(data, path):
+    # xlwt is not a project dependency; it is only needed for .xls fixtures
+    import xlwt
+
+    book = xlwt.Workbook(encoding="utf-8")
+    sheet = book.add_sheet("Sheet1")
+    for r, row in enumerate(data):
+        if r >= XLS_MAX_ROWS:
+            raise ValueError(f".xls files hold at most {XLS_MAX_ROWS} rows")
+        for c, value in enumerate(row):
+            sheet.write(r, c, value)
+    book.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("layout", choices=sorted(LAYOUTS))
+    parser.add_argument("rows", type=int, help="Number of transactions")
+    parser.add_argument("output", help="Output .xls or .xlsx path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate(args.layout, args.rows, args.output, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
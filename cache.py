@@ -0,0 +1,153 @@
+import glob
+import hashlib
+import os
+import re
+import shutil
+import time
+
+# Default limits for the on-disk conversion cache
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024  # bytes
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+ENTRY_SUFFIX = ".out"
+
+_BLOCK_SIZE = 1024 * 1024
+_tool_version = None
+
+
+def default_cache_dir():
+    """
+    Returns the cache directory: $BANK_STATEMENT_SYNC_CACHE_DIR if set,
+    otherwise bank_statement_sync under $XDG_CACHE_HOME or ~/.cache.
+    """
+    directory = os.environ.get("BANK_STATEMENT_SYNC_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "bank_statement_sync")
+
+
+def file_digest(path):
+    """
+    Returns the SHA-256 hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tool_version():
+    """
+    Identifies the converter build: the release version from __init__.py
+    plus a digest of the converter sources, so that any code change
+    invalidates previously cached conversions.
+    """
+    global _tool_version
+    if _tool_version is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(root, "*.py"))):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        with open(os.path.join(root, "__init__.py"), encoding="utf-8") as f:
+            match = re.search(r'__version__ = "([^"]+)"', f.read())
+        version = match.group(1) if match else "0"
+        _tool_version = f"{version}+{digest.hexdigest()[:16]}"
+    return _tool_version
+
+
+class ConversionCache:
+    """
+    On-disk cache of converted outputs (CSV, Parquet or Arrow files) keyed
+    by the input file content, the output format and the tool version. Entries older than max_age seconds are dropped,
+    and the least recently used ones go first once the cache grows
+    beyond max_size bytes.
+    """
+
+    def __init__(
+        self, directory=None, max_size=DEFAULT_MAX_SIZE, max_age=DEFAULT_MAX_AGE
+    ):
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def key(self, input_file, output_format="csv", sheet=None):
+        """
+        Returns the cache key for an input file converted to output_format,
+        or for one of its sheets when sheet names it.
+        """
+        payload = f"{tool_version()}:{output_format}:{file_digest(input_file)}"
+        if sheet is not None:
+            payload += f":{sheet}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        # The key already covers the output format, so every entry gets the
+        # same neutral suffix whatever the format
+        return os.path.join(self.directory, key[:2], key + ENTRY_SUFFIX)
+
+    def lookup(self, key):
+        """
+        Returns the path of the cached output for key, or None.
+        A hit refreshes the entry's last-use time.
+        """
+        path = self._entry_path(key)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        if time.time() - mtime > self.max_age:
+            self._remove(path)
+            return None
+        os.utime(path)
+        return path
+
+    def store(self, key, output_file):
+        """
+        Copies a freshly written output file into the cache under key.
+        """
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Copy to a temporary name first so readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(output_file, tmp_path)
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        """
+        Removes expired entries, then the least recently used ones until
+        the cache fits into max_size.
+        """
+        # Entries of earlier versions were named <key>.csv and are never
+        # looked up again
+        for path in glob.glob(os.path.join(self.directory, "*", "*.csv")):
+            self._remove(path)
+        now = time.time()
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*", "*" + ENTRY_SUFFIX)):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                self._remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        # Another process may have evicted the same entry already
+        try:
+            os.remove(path)
+        except OSError:
+            pass
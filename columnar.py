@@ -0,0 +1,101 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Number of rows turned into records at a time by the processors
+CHUNK_SIZE = 10000
+
+
+def to_datetime_column(values, dayfirst, format=None):
+    """
+    Parses a whole column of date/time values in one call, with the
+    explicit format first when one is given.
+    Falls back to element-wise parsing when the column mixes formats,
+    which is what the per-row processors did for every value.
+    """
+    if format is not None:
+        try:
+            return pd.to_datetime(values, format=format)
+        except (ValueError, TypeError):
+            pass
+    try:
+        return pd.to_datetime(values, dayfirst=dayfirst)
+    except (ValueError, TypeError):
+        return pd.to_datetime(
+            values.map(lambda v: pd.to_datetime(v, dayfirst=dayfirst))
+        )
+
+
+def as_text(values):
+    """
+    Converts a column to strings the same way str() does for single cells,
+    including the 'nan' text for empty cells.
+    """
+    return values.astype(str).fillna("nan")
+
+
+def interned(values):
+    """
+    Returns the strings of values as a list in which equal strings are a
+    single object, e.g. the handful of categories of a statement instead
+    of a new string per row.
+    """
+    return list(map(sys.intern, values))
+
+
+def sparse_list(mask, values):
+    """
+    Returns a list with an item per entry of the boolean mask: the next
+    of values where mask is set and None elsewhere.
+    """
+    result = [None] * len(mask)
+    for i, value in zip(np.flatnonzero(mask).tolist(), values):
+        result[i] = value
+    return result
+
+
+def header_names(values):
+    """
+    Turns header row cells into column names the way read_excel does:
+    empty cells become 'Unnamed: <i>' and duplicates get .1, .2 suffixes.
+    """
+    columns = []
+    seen = {}
+    for i, name in enumerate(values):
+        if pd.isna(name):
+            name = f"Unnamed: {i}"
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        if count:
+            name = f"{name}.{count}"
+        columns.append(name)
+    return columns
+
+
+def frame_with_header(raw, header_idx, columns=None):
+    """
+    Builds a data frame from a sheet read with header=None, using row
+    header_idx as column names, as read_excel(header=header_idx) would.
+    Saves a second parse of the workbook when the header row is not
+    known up front.
+    With columns, a dict mapping column names to dtypes, only those
+    columns are kept and they are cast instead of type-inferred.
+    """
+    names = header_names(raw.iloc[header_idx].tolist())
+    if columns is None:
+        df = raw.iloc[header_idx + 1 :].reset_index(drop=True)
+        df.columns = names
+        return df.infer_objects()
+    keep = [i for i, name in enumerate(names) if name in columns]
+    df = raw.iloc[header_idx + 1 :, keep].reset_index(drop=True)
+    df.columns = [names[i] for i in keep]
+    return df.astype({name: columns[name] for name in df.columns})
+
+
+def iter_chunks(df, chunk_size=CHUNK_SIZE):
+    """
+    Yields consecutive row slices of df with at most chunk_size rows.
+    """
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start : start + chunk_size]
@@ -0,0 +1,44 @@
+import datetime
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+# Output formats of the Date column and of the time added to Details
+DATE_OUTPUT_FORMAT = "%Y/%m/%d"
+TIME_OUTPUT_FORMAT = "%H:%M:%S"
+
+# A time that can be copied to the output as it is
+_TIME = re.compile(r"(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d")
+
+
+def parse_date_time(value, fmt, dayfirst):
+    """
+    Returns the (yyyy/mm/dd, HH:MM:SS) strings for a statement date cell.
+    Strings in the explicit format fmt, e.g. '%d.%m.%Y %H:%M:%S', are
+    split into date and time; the date part is parsed through a bounded
+    cache, since statements repeat the same day many times. Anything
+    else goes to pd.to_datetime with dayfirst, as the processors did for
+    every row before, so the result is the same either way.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.strftime(DATE_OUTPUT_FORMAT), value.strftime(TIME_OUTPUT_FORMAT)
+    if isinstance(value, str):
+        date_text, _, time_text = value.partition(" ")
+        if _TIME.fullmatch(time_text):
+            try:
+                return _date_part(date_text, fmt.partition(" ")[0]), time_text
+            except ValueError:
+                pass
+    dt = pd.to_datetime(value, dayfirst=dayfirst)
+    return dt.strftime(DATE_OUTPUT_FORMAT), dt.strftime(TIME_OUTPUT_FORMAT)
+
+
+@lru_cache(maxsize=4096)
+def _date_part(text, date_format):
+    """
+    Reformats a date in date_format as yyyy/mm/dd; raises ValueError
+    when it does not match.
+    """
+    parsed = datetime.datetime.strptime(text, date_format)
+    return parsed.strftime(DATE_OUTPUT_FORMAT)
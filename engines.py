@@ -0,0 +1,63 @@
+import importlib.util
+import os
+from functools import lru_cache
+
+# Excel parsing engines in order of preference: calamine (Rust, through
+# the python-calamine package) reads both file types many times faster
+# than the pure Python openpyxl (XLSX) and xlrd (XLS)
+ENGINES = ("calamine", "openpyxl", "xlrd")
+
+# Package that provides each engine, as named for pip
+PACKAGES = {"calamine": "python-calamine", "openpyxl": "openpyxl", "xlrd": "xlrd"}
+
+# File types each engine reads
+_EXTENSIONS = {
+    "calamine": (".xls", ".xlsx"),
+    "openpyxl": (".xlsx",),
+    "xlrd": (".xls",),
+}
+
+_MODULES = {"calamine": "python_calamine", "openpyxl": "openpyxl", "xlrd": "xlrd"}
+
+
+@lru_cache(maxsize=None)
+def is_available(engine):
+    """
+    Tells whether the package behind engine is installed. pandas reads
+    with calamine from version 2.2 on.
+    """
+    if importlib.util.find_spec(_MODULES[engine]) is None:
+        return False
+    if engine == "calamine":
+        import pandas as pd
+
+        version = tuple(int(part) for part in pd.__version__.split(".")[:2])
+        return version >= (2, 2)
+    return True
+
+
+def choose_engine(path, engine=None, streaming=False):
+    """
+    Returns the engine to read path with. A given engine is checked to
+    read the file type and to be installed; otherwise the preferred
+    available engine for the file type is picked. Streaming reads prefer
+    openpyxl and xlrd, which keep only one row in memory, whereas
+    calamine loads the whole sheet.
+    Returns None for unknown file types, leaving the choice to pandas.
+    Raises ValueError when the given engine cannot be used.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if engine is not None:
+        if extension not in _EXTENSIONS[engine]:
+            raise ValueError(f"Engine '{engine}' cannot read {extension} files")
+        if not is_available(engine):
+            raise ValueError(
+                f"Engine '{engine}' needs {PACKAGES[engine]} "
+                f"(pip install {PACKAGES[engine]})"
+            )
+        return engine
+    preferred = ENGINES[1:] + ENGINES[:1] if streaming else ENGINES
+    for candidate in preferred:
+        if extension in _EXTENSIONS[candidate] and is_available(candidate):
+            return candidate
+    return None
@@ -0,0 +1,394 @@
+import struct
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+_ZIP_MAGIC = b"PK\x03\x04"
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# OLE2 compound file, the container of XLS files
+_OLE_END_OF_CHAIN = 0xFFFFFFFE
+_OLE_HEADER_DIFAT = 109
+_OLE_DIR_ENTRY_SIZE = 128
+
+# BIFF8 records
+_XLS_BOF = 0x0809
+_XLS_BIFF8 = 0x0600
+_XLS_BOUNDSHEET = 0x0085
+_XLS_SST = 0x00FC
+_XLS_CONTINUE = 0x003C
+_XLS_EOF = 0x000A
+_XLS_LABELSST = 0x00FD
+_XLS_LABEL = 0x0204
+_XLS_RSTRING = 0x00D6
+# Other cell records; A1 holding one of these is not a text marker
+_XLS_OTHER_CELLS = (0x0006, 0x00BD, 0x00BE, 0x0201, 0x0203, 0x0205, 0x027E)
+
+
+def read_first_cell(path, sheet=None):
+    """
+    Reads the text of cell A1 on the first sheet, or on the sheet named
+    sheet, without parsing the workbook: for XLSX only the workbook
+    parts, the start of the sheet and the shared strings up to the
+    needed one are read from the zip; for XLS only the workbook globals,
+    the records before the first cell and the shared strings up to the
+    needed one are read from the OLE2 file, sector by sector.
+    Returns None when unsure (A1 empty or not text, unknown layout,
+    unreadable file), so the caller can fall back to pandas.
+    """
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(8)
+        if magic.startswith(_ZIP_MAGIC):
+            text = _xlsx_first_cell(path, sheet)
+        elif magic == _OLE_MAGIC:
+            text = _xls_first_cell(path, sheet)
+        else:
+            return None
+    except Exception:
+        return None
+    # An empty string cell reads as empty in pandas too
+    return text or None
+
+
+def read_sheet_names(path):
+    """
+    Returns the names of the sheets in workbook order, read from the
+    workbook part (XLSX) or the workbook globals (XLS) without loading
+    any sheet, or None when unsure.
+    """
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(8)
+        if magic.startswith(_ZIP_MAGIC):
+            with zipfile.ZipFile(path) as zf:
+                return [el.get("name") for el in _sheet_elements(zf)]
+        if magic == _OLE_MAGIC:
+            with open(path, "rb") as f:
+                workbook = _xls_globals(_OleStream(f, "Workbook"))
+            if workbook is not None:
+                return [name for name, _ in workbook[0]]
+    except Exception:
+        pass
+    return None
+
+
+def _local(tag):
+    # Strip the namespace so both transitional and strict OOXML match
+    return tag.rsplit("}", 1)[-1]
+
+
+def _sheet_elements(zf):
+    root = ET.fromstring(zf.read("xl/workbook.xml"))
+    return [el for el in root.iter() if _local(el.tag) == "sheet"]
+
+
+def _sheet_path(zf, name=None):
+    # The first sheet, or the one with the given name
+    sheets = _sheet_elements(zf)
+    if name is not None:
+        sheets = [el for el in sheets if el.get("name") == name]
+    sheet = sheets[0]
+    rel_id = sheet.get(f"{{{_REL_NS}}}id")
+    if rel_id is None:
+        # Strict OOXML uses another namespace for the relationship id
+        rel_id = next(v for k, v in sheet.attrib.items() if _local(k) == "id")
+
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels:
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    return None
+
+
+def _xlsx_first_cell(path, sheet=None):
+    with zipfile.ZipFile(path) as zf:
+        sheet_path = _sheet_path(zf, sheet)
+        if sheet_path is None:
+            return None
+
+        # Stream the sheet XML only up to its first cell
+        cell = None
+        with zf.open(sheet_path) as f:
+            for _, el in ET.iterparse(f):
+                if _local(el.tag) == "c":
+                    cell = el
+                    break
+        if cell is None or cell.get("r", "A1") != "A1":
+            return None
+
+        cell_type = cell.get("t")
+        if cell_type == "inlineStr":
+            return "".join(el.text or "" for el in cell.iter() if _local(el.tag) == "t")
+        value = next((el.text for el in cell if _local(el.tag) == "v"), None)
+        if value is None:
+            return None
+        if cell_type == "str":
+            return value
+        if cell_type != "s":
+            return None
+        return _shared_string(zf, int(value))
+
+
+def _shared_string(zf, index):
+    # Stream the shared strings only up to the requested entry
+    with zf.open("xl/sharedStrings.xml") as f:
+        position = 0
+        for _, el in ET.iterparse(f):
+            if _local(el.tag) != "si":
+                continue
+            if position == index:
+                # Rich text runs are concatenated; phonetic hints are skipped
+                parts = []
+                for child in el:
+                    name = _local(child.tag)
+                    if name == "t":
+                        parts.append(child.text or "")
+                    elif name == "r":
+                        parts.extend(
+                            t.text or "" for t in child if _local(t.tag) == "t"
+                        )
+                return "".join(parts)
+            position += 1
+            el.clear()
+    return None
+
+
+class _OleStream:
+    """
+    One stream of an OLE2 compound file, read sector by sector on demand
+    instead of loading the whole file. Streams kept in the mini stream
+    (below 4096 bytes) are not supported.
+    Raises ValueError when the stream cannot be read this way.
+    """
+
+    def __init__(self, f, name):
+        self._file = f
+        f.seek(0)
+        header = f.read(512)
+        self._sector_size = 1 << struct.unpack("<H", header[30:32])[0]
+        num_fat, first_dir = struct.unpack("<II", header[44:52])
+        mini_cutoff = struct.unpack("<I", header[56:60])[0]
+        first_difat, num_difat = struct.unpack("<II", header[68:76])
+
+        # The FAT sectors are listed in the header, then in DIFAT sectors
+        per_sector = self._sector_size // 4
+        fat_sectors = list(struct.unpack(f"<{_OLE_HEADER_DIFAT}I", header[76:512]))
+        sector = first_difat
+        for _ in range(num_difat):
+            entries = struct.unpack(f"<{per_sector}I", self._sector(sector))
+            fat_sectors.extend(entries[:-1])
+            sector = entries[-1]
+        fat = []
+        for sector in fat_sectors[:num_fat]:
+            fat.extend(struct.unpack(f"<{per_sector}I", self._sector(sector)))
+        self._fat = fat
+
+        for entry in self._directory(first_dir):
+            name_size = struct.unpack("<H", entry[64:66])[0]
+            entry_name = entry[: max(name_size - 2, 0)].decode("utf-16-le")
+            if entry[66] == 2 and entry_name.lower() == name.lower():
+                start = struct.unpack("<I", entry[116:120])[0]
+                if self._sector_size > 512:
+                    self._size = struct.unpack("<Q", entry[120:128])[0]
+                else:
+                    # Version 3 files only use the low 32 bits of the size
+                    self._size = struct.unpack("<I", entry[120:124])[0]
+                break
+        else:
+            raise ValueError(f"No '{name}' stream")
+        if self._size < mini_cutoff:
+            raise ValueError(f"'{name}' is in the mini stream")
+        # Followed only as far as the stream is read
+        self._chain = [start]
+
+    def _sector(self, sector):
+        self._file.seek((sector + 1) * self._sector_size)
+        return self._file.read(self._sector_size)
+
+    def _follow(self, sector):
+        chain = []
+        while sector != _OLE_END_OF_CHAIN:
+            if sector >= len(self._fat) or len(chain) > len(self._fat):
+                raise ValueError("Broken sector chain")
+            chain.append(sector)
+            sector = self._fat[sector]
+        return chain
+
+    def _chain_sector(self, index):
+        # The sector holding block index of the stream
+        chain = self._chain
+        while index >= len(chain):
+            sector = self._fat[chain[-1]]
+            if sector >= len(self._fat) or len(chain) >= len(self._fat):
+                raise ValueError("Broken sector chain")
+            chain.append(sector)
+        return chain[index]
+
+    def _directory(self, first_dir):
+        for sector in self._follow(first_dir):
+            data = self._sector(sector)
+            for offset in range(0, len(data), _OLE_DIR_ENTRY_SIZE):
+                yield data[offset : offset + _OLE_DIR_ENTRY_SIZE]
+
+    def read(self, pos, size):
+        """
+        Returns up to size bytes of the stream from pos on.
+        """
+        size = min(size, self._size - pos)
+        chunks = []
+        while size > 0:
+            index, offset = divmod(pos, self._sector_size)
+            length = min(size, self._sector_size - offset)
+            sector = self._chain_sector(index)
+            self._file.seek((sector + 1) * self._sector_size + offset)
+            chunks.append(self._file.read(length))
+            pos += length
+            size -= length
+        return b"".join(chunks)
+
+
+def _xls_records(stream, pos):
+    # Yields (code, body position, body length) of the BIFF records from pos
+    while True:
+        header = stream.read(pos, 4)
+        if len(header) < 4:
+            return
+        code, length = struct.unpack("<HH", header)
+        yield code, pos + 4, length
+        pos += 4 + length
+
+
+def _xls_globals(stream):
+    """
+    Scans the workbook globals and returns ([(sheet name, BOF position)],
+    SST position or None) for the worksheets, or None for files older
+    than BIFF8. Only the records' headers are read, apart from BOF and
+    BOUNDSHEET.
+    """
+    records = _xls_records(stream, 0)
+    code, pos, length = next(records)
+    bof = stream.read(pos, length)
+    if code != _XLS_BOF or struct.unpack("<H", bof[:2])[0] != _XLS_BIFF8:
+        return None
+    sheets = []
+    sst = None
+    for code, pos, length in records:
+        if code == _XLS_EOF:
+            break
+        if code == _XLS_BOUNDSHEET:
+            body = stream.read(pos, length)
+            offset, _, sheet_type = struct.unpack("<IBB", body[:6])
+            # Macro sheets, charts and VBA modules are not worksheets
+            if sheet_type == 0:
+                sheets.append((_xls_string(body, 6, 1), offset))
+        elif code == _XLS_SST:
+            sst = pos - 4
+    return sheets, sst
+
+
+def _xls_string(data, pos, lenlen):
+    # An XLUnicodeString held in one record
+    nchars = struct.unpack("<" + "BH"[lenlen - 1], data[pos : pos + lenlen])[0]
+    if not nchars:
+        return ""
+    pos += lenlen
+    options = data[pos]
+    pos += 1
+    if options & 0x08:  # rich text runs
+        pos += 2
+    if options & 0x04:  # phonetic data
+        pos += 4
+    if options & 0x01:
+        return data[pos : pos + 2 * nchars].decode("utf-16-le")
+    return data[pos : pos + nchars].decode("latin-1")
+
+
+def _sst_string(stream, sst, index):
+    """
+    Returns entry index of the shared strings starting with the SST
+    record at sst. The SST and its CONTINUE records are read one at a
+    time, only up to that entry; earlier entries are skipped undecoded.
+    """
+    records = _xls_records(stream, sst)
+
+    def next_data():
+        code, pos, length = next(records)
+        if code not in (_XLS_SST, _XLS_CONTINUE):
+            raise ValueError("Truncated SST")
+        return stream.read(pos, length)
+
+    data = next_data()
+    pos = 8
+    for position in range(index + 1):
+        nchars, options = struct.unpack("<HB", data[pos : pos + 3])
+        pos += 3
+        runs = phonetic = 0
+        if options & 0x08:
+            runs = struct.unpack("<H", data[pos : pos + 2])[0]
+            pos += 2
+        if options & 0x04:
+            phonetic = struct.unpack("<i", data[pos : pos + 4])[0]
+            pos += 4
+        # Characters may continue in the next record, which starts with
+        # its own compression flag
+        parts = []
+        remaining = nchars
+        while True:
+            if options & 0x01:
+                count = min((len(data) - pos) // 2, remaining)
+                if position == index:
+                    parts.append(data[pos : pos + 2 * count].decode("utf-16-le"))
+                pos += 2 * count
+            else:
+                count = min(len(data) - pos, remaining)
+                if position == index:
+                    parts.append(data[pos : pos + count].decode("latin-1"))
+                pos += count
+            remaining -= count
+            if not remaining:
+                break
+            data = next_data()
+            options = data[0]
+            pos = 1
+        if position == index:
+            return "".join(parts)
+        # Skip the formatting runs and phonetic data, which may also
+        # spill into the next record
+        pos += 4 * runs + phonetic
+        while pos >= len(data):
+            pos -= len(data)
+            data = next_data()
+    return None
+
+
+def _xls_first_cell(path, sheet=None):
+    with open(path, "rb") as f:
+        stream = _OleStream(f, "Workbook")
+        workbook = _xls_globals(stream)
+        if workbook is None:
+            return None
+        sheets, sst = workbook
+        names = [name for name, _ in sheets]
+        offset = sheets[0 if sheet is None else names.index(sheet)][1]
+        for code, pos, length in _xls_records(stream, offset):
+            if code == _XLS_EOF:
+                return None
+            if code in (_XLS_LABELSST, _XLS_LABEL, _XLS_RSTRING) + _XLS_OTHER_CELLS:
+                body = stream.read(pos, length)
+                row, col = struct.unpack("<HH", body[:4])
+                if (row, col) != (0, 0):
+                    return None
+                if code == _XLS_LABELSST:
+                    if sst is None:
+                        return None
+                    return _sst_string(stream, sst, struct.unpack("<I", body[6:10])[0])
+                if code in (_XLS_LABEL, _XLS_RSTRING):
+                    return _xls_string(body, 6, 2)
+                return None
+        return None
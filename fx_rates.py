@@ -0,0 +1,106 @@
+import os
+
+from money import format_minor, rate_minor
+from output import write_rows
+
+# Columns of the FX rate table: per day and currency, the number of
+# converted transactions, their original and converted turnover and the
+# effective rate (converted / original)
+FX_FIELDNAMES = (
+    "Date",
+    "Currency",
+    "Transactions",
+    "Original",
+    "Converted",
+    "Rate",
+    "Min Rate",
+    "Max Rate",
+)
+
+
+def fx_rates_file(output_file):
+    """
+    Returns the path of the FX rate table written next to output_file:
+    <output>.fx-rates.csv.
+    """
+    base_name, _ = os.path.splitext(output_file)
+    return base_name + ".fx-rates.csv"
+
+
+class FxRateTable:
+    """
+    The exchange rates of one statement by (date, currency), built from
+    its Transactions as they are written. Turnover sums the absolute
+    amounts, so refunds do not cancel purchases out; min and max are taken
+    over the per-transaction rates shown in Details.
+    """
+
+    def __init__(self):
+        # (date, currency) -> [count, original, converted, min rate, max rate]
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, transaction):
+        """
+        Counts transaction in when it was converted from another currency.
+        """
+        currency = transaction.original_currency
+        if currency is None:
+            return
+        key = (transaction.date, currency)
+        rate = transaction.fx_rate
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = [
+                1,
+                abs(transaction.original_amount),
+                abs(transaction.amount),
+                rate,
+                rate,
+            ]
+            return
+        entry[0] += 1
+        entry[1] += abs(transaction.original_amount)
+        entry[2] += abs(transaction.amount)
+        if rate < entry[3]:
+            entry[3] = rate
+        elif rate > entry[4]:
+            entry[4] = rate
+
+    def collect(self, records):
+        """
+        Yields records unchanged while adding each one to the table.
+        """
+        add = self.add
+        for record in records:
+            add(record)
+            yield record
+
+    def rows(self):
+        """
+        Returns the table rows, in FX_FIELDNAMES order, sorted by date and
+        currency.
+        """
+        return [
+            (
+                date,
+                currency,
+                count,
+                format_minor(original),
+                format_minor(converted),
+                format_minor(rate_minor(converted, original)),
+                format_minor(low),
+                format_minor(high),
+            )
+            for (date, currency), (count, original, converted, low, high) in sorted(
+                self._entries.items()
+            )
+        ]
+
+    def write(self, path):
+        """
+        Writes the table as CSV and returns the number of rows written.
+        """
+        return write_rows(self.rows(), path, fieldnames=FX_FIELDNAMES)
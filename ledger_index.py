@@ -0,0 +1,137 @@
+import csv
+import hashlib
+import heapq
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left
+
+from transaction import record_row
+
+# Index file layout: magic, ledger size in bytes, key count, sorted keys
+_MAGIC = b"BSSIDX1\0"
+_HEADER = struct.Struct("<8sQQ")
+_KEY_TYPE = "Q"
+
+_SPACES = re.compile(r"\s+")
+
+
+def transaction_key(record, occurrence=0):
+    """
+    Returns a 64-bit key for a record (a Transaction or a ledger row dict)
+    built from its Date, Sum and normalized Details (which carry the
+    transaction time).
+    occurrence tells apart identical transactions within one statement.
+    """
+    date, details, sum_str = record_row(record)
+    details = _SPACES.sub(" ", str(details)).strip().casefold()
+    text = f"{date}\x1f{sum_str}\x1f{details}\x1f{occurrence}"
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class LedgerIndex:
+    """
+    Compact index of the transactions already exported to a ledger CSV.
+    Keys are kept as a sorted array of 64-bit hashes (8 bytes per
+    transaction) in '<ledger>.idx' and looked up by binary search.
+    The index is rebuilt from the ledger when missing or out of date.
+    """
+
+    def __init__(self, ledger_file):
+        self.ledger_file = ledger_file
+        self.index_file = ledger_file + ".idx"
+        self._known = array(_KEY_TYPE)
+        self._new = set()
+
+    @classmethod
+    def load(cls, ledger_file):
+        index = cls(ledger_file)
+        if not index._read_index():
+            index._rebuild()
+        return index
+
+    def __len__(self):
+        return len(self._known) + len(self._new)
+
+    def __contains__(self, key):
+        if key in self._new:
+            return True
+        i = bisect_left(self._known, key)
+        return i < len(self._known) and self._known[i] == key
+
+    def filter_new(self, records):
+        """
+        Yields only the records of one statement that are not in the
+        ledger yet and remembers them as known.
+        """
+        occurrences = {}
+        for record in records:
+            base = transaction_key(record)
+            occurrence = occurrences.get(base, 0)
+            occurrences[base] = occurrence + 1
+            key = transaction_key(record, occurrence) if occurrence else base
+            if key in self:
+                continue
+            self._new.add(key)
+            yield record
+
+    def save(self):
+        """
+        Merges the keys added by filter_new into the index file.
+        Call it after the new records were appended to the ledger.
+        """
+        if self._new:
+            self._known = array(_KEY_TYPE, heapq.merge(self._known, sorted(self._new)))
+            self._new = set()
+        self._write_index()
+
+    def discard(self):
+        """
+        Forgets the keys added by filter_new since the last save.
+        """
+        self._new = set()
+
+    def _ledger_size(self):
+        try:
+            return os.path.getsize(self.ledger_file)
+        except OSError:
+            return 0
+
+    def _read_index(self):
+        try:
+            with open(self.index_file, "rb") as f:
+                magic, ledger_size, count = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or ledger_size != self._ledger_size():
+                    return False
+                keys = array(_KEY_TYPE)
+                keys.frombytes(f.read(count * keys.itemsize))
+        except (OSError, struct.error):
+            return False
+        if len(keys) != count:
+            return False
+        self._known = keys
+        return True
+
+    def _write_index(self):
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self._ledger_size(), len(self._known)))
+            f.write(self._known.tobytes())
+        os.replace(tmp_path, self.index_file)
+
+    def _rebuild(self):
+        keys = []
+        if os.path.exists(self.ledger_file):
+            occurrences = {}
+            with open(self.ledger_file, newline="", encoding="utf-8") as f:
+                for record in csv.DictReader(f):
+                    base = transaction_key(record)
+                    occurrence = occurrences.get(base, 0)
+                    occurrences[base] = occurrence + 1
+                    keys.append(
+                        transaction_key(record, occurrence) if occurrence else base
+                    )
+        self._known = array(_KEY_TYPE, sorted(set(keys)))
+        self._new = set()
@@ -1,58 +1,860 @@
 #!/usr/bin/env python3
 
 import argparse
+import filecmp
+import glob
+import importlib.util
+import json
 import logging
 import os
+import re
+import shutil
 import sys
+import tempfile
+import time
 
-# Import modules for structure detection and processing
-from structure_detector import detect_structure
-from processor_privat import process as process_privat
-from processor_raif import process as process_raif
-from output import write_csv
+# Structure detection and the processors import pandas, which dominates
+# start-up time; they are imported in convert_file once a conversion runs
+import timings
+from cache import DEFAULT_MAX_AGE, DEFAULT_MAX_SIZE, ConversionCache, tool_version
+from engines import ENGINES, PACKAGES, is_available
+from ledger_index import LedgerIndex
+from output import OUTPUT_FORMATS
+from watch import is_statement_name
 
+# File extensions picked up when a directory is passed as input
+STATEMENT_EXTENSIONS = (".xls", ".xlsx")
+
+# Exit code when some, but not all, of several inputs failed
+EXIT_PARTIAL_FAILURE = 2
+
+# How the sheets of a workbook are converted: only the first one, every
+# sheet with a known layout into one output, or into one output each
+SHEET_MODES = ("first", "merge", "split")
+
+logger = logging.getLogger(__name__)
+
+
+class ConversionError(Exception):
+    """
+    Raised by convert_file with a message ready to be shown to the user.
+    """
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Process XLS/XLSX file and output CSV with Date, Details, and Sum columns."
-    )
-    parser.add_argument("input_file", help="Path to the input XLS or XLSX file")
-    args = parser.parse_args()
 
-    input_file = args.input_file
+def convert_file(
+    input_file,
+    stream=False,
+    cache=None,
+    ledger=None,
+    output_format="csv",
+    engine=None,
+    sheet=None,
+    output_file=None,
+    fx_rates=False,
+):
+    """
+    Converts one statement into a CSV file next to it, or a Parquet or
+    Arrow file with output_format 'parquet' or 'arrow'.
+    engine picks the Excel parsing engine (see engines.py).
+    sheet names the sheet to convert instead of the first one, and
+    output_file replaces the default output path.
+    With fx_rates set, the exchange rates of the statement by day and
+    currency are also written to a CSV next to the output (see
+    fx_rates.py); not with a ledger.
+    With a ConversionCache, a statement whose content was converted
+    before is not processed again.
+    With a LedgerIndex, only transactions missing from the ledger are
+    appended to the ledger CSV instead.
+    Returns the path of the written file.
+    """
     # Check that the input file exists
     if not os.path.isfile(input_file):
-        print(f"Error: File '{input_file}' does not exist.", file=sys.stderr)
-        sys.exit(1)
+        raise ConversionError(f"Error: File '{input_file}' does not exist.")
+
+    # Build output path by replacing the extension
+    if output_file is None:
+        base_name, _ = os.path.splitext(input_file)
+        output_file = base_name + OUTPUT_FORMATS[output_format]
+    if ledger is not None:
+        output_file = ledger.ledger_file
+        # The ledger is appended to, so the per-file cache does not apply
+        cache = None
+    if fx_rates:
+        # The cache only keeps the main output
+        cache = None
+
+    if cache is not None:
+        key = cache.key(input_file, output_format, sheet)
+        cached = cache.lookup(key)
+        if cached is not None:
+            # Keep an up-to-date output untouched, restore it otherwise
+            if not (
+                os.path.isfile(output_file)
+                and filecmp.cmp(cached, output_file, shallow=False)
+            ):
+                shutil.copyfile(cached, output_file)
+            logger.info("Cache hit for '%s', conversion skipped", input_file)
+            return output_file
+
+    # Import modules for structure detection and processing
+    from registry import load_processor
+    from structure_detector import detect_structure
+    from output import write_csv, write_output
+    from workbook import Workbook
+
+    # Open the input once; detection and processing share the parsed sheet
+    try:
+        workbook = Workbook(input_file, streaming=stream, engine=engine, sheet=sheet)
+    except ValueError as e:
+        raise ConversionError(f"Error: {e}")
 
     # Detect the structure of the input file (privat or raif)
     try:
-        structure = detect_structure(input_file)
+        with timings.stage("detect"):
+            structure = detect_structure(workbook)
     except Exception as e:
-        print(f"Error detecting structure: {e}", file=sys.stderr)
-        sys.exit(1)
+        raise ConversionError(f"Error detecting structure: {e}")
 
-    # Process the file according to its detected structure
-    if structure == "privat":
-        records = process_privat(input_file)
-    elif structure == "raif":
-        records = process_raif(input_file)
-    else:
-        print(f"Unknown structure '{structure}'.", file=sys.stderr)
-        sys.exit(1)
+    # Pick the processor for the detected structure; records are produced
+    # lazily and consumed by write_csv as they come
+    try:
+        processor = load_processor(structure)
+    except ValueError as e:
+        raise ConversionError(str(e))
+    records = processor.stream(workbook) if stream else processor.iter_records(workbook)
+    records = timings.timed_iter(records, "process")
+
+    if ledger is not None:
+        return _append_to_ledger(records, input_file, ledger, write_csv)
+
+    if fx_rates:
+        from fx_rates import FxRateTable, fx_rates_file
+
+        table = FxRateTable()
+        records = table.collect(records)
+
+    # Process the file and write out the CSV (or Parquet/Arrow file)
+    try:
+        with timings.stage("write_csv"):
+            written = write_output(records, output_file, output_format)
+            if fx_rates:
+                table.write(fx_rates_file(output_file))
+        timings.add_rows("write_csv", written)
+    except Exception as e:
+        # Do not leave a partially written file behind
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        raise ConversionError(f"Error processing file: {e}")
+
+    if cache is not None:
+        cache.store(key, output_file)
+    return output_file
+
+
+def _append_to_ledger(records, input_file, ledger, write_csv):
+    """
+    Appends the records not yet in the ledger and updates its index.
+    """
+    ledger_file = ledger.ledger_file
+    size = os.path.getsize(ledger_file) if os.path.exists(ledger_file) else 0
+    try:
+        with timings.stage("write_csv"):
+            written = write_csv(ledger.filter_new(records), ledger_file, append=True)
+        timings.add_rows("write_csv", written)
+    except Exception as e:
+        # Roll the ledger back to where it was before this statement
+        ledger.discard()
+        with open(ledger_file, "r+b") as f:
+            f.truncate(size)
+        raise ConversionError(f"Error processing file: {e}")
+
+    ledger.save()
+    logger.info(
+        "Appended %d new transactions from '%s' to '%s'",
+        written,
+        input_file,
+        ledger_file,
+    )
+    return ledger_file
+
+
+def expand_inputs(inputs):
+    """
+    Expands the command-line inputs into a list of statement files.
+    Each input may be a file, a directory (its XLS/XLSX files are taken)
+    or a glob pattern. Hidden files and Excel lock files (~$name.xlsx) in
+    directories and glob matches are skipped. Inputs that match nothing
+    are kept as they are, so that convert_file reports them as missing.
+    """
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(
+                os.path.join(item, name)
+                for name in os.listdir(item)
+                if is_statement_name(name, STATEMENT_EXTENSIONS)
+            )
+        elif glob.has_magic(item):
+            matches = sorted(
+                path
+                for path in glob.glob(item)
+                if is_statement_name(os.path.basename(path), STATEMENT_EXTENSIONS)
+            )
+        else:
+            matches = [item]
+        files.extend(matches or [item])
+
+    # Drop duplicates while keeping the order
+    return list(dict.fromkeys(files))
 
-    # Build output CSV path by replacing the extension
+
+def convert_one(
+    input_file,
+    stream=False,
+    cache=None,
+    timed=False,
+    ledger=None,
+    output_format="csv",
+    engine=None,
+    sheet=None,
+    output_file=None,
+    fx_rates=False,
+):
+    """
+    Runs convert_file and returns (output_file, error, stages) instead of
+    raising, where stages holds per-stage timings when timed is set.
+    """
+    if timed:
+        timings.start()
+    written_file = error = None
+    try:
+        written_file = convert_file(
+            input_file,
+            stream=stream,
+            cache=cache,
+            ledger=ledger,
+            output_format=output_format,
+            engine=engine,
+            sheet=sheet,
+            output_file=output_file,
+            fx_rates=fx_rates,
+        )
+    except ConversionError as e:
+        error = str(e)
+    except Exception as e:
+        error = f"Unexpected error: {e}"
+    finally:
+        collected = timings.stop() if timed else None
+    return written_file, error, collected.as_dict() if collected else None
+
+
+def convert_files(
+    input_files,
+    stream=False,
+    workers=None,
+    cache=None,
+    timed=False,
+    output_format="csv",
+    engine=None,
+    fx_rates=False,
+):
+    """
+    Converts several statements in parallel on a process pool.
+    Returns a list of (input_file, output_file, error, stages) tuples in
+    input order, where exactly one of output_file and error is None.
+    """
+    options = dict(
+        stream=stream,
+        cache=cache,
+        timed=timed,
+        output_format=output_format,
+        engine=engine,
+        fx_rates=fx_rates,
+    )
+    tasks = [dict(options, input_file=input_file) for input_file in input_files]
+    return [
+        (input_file,) + result
+        for input_file, result in zip(input_files, _run_in_pool(tasks, workers))
+    ]
+
+
+def _run_in_pool(tasks, workers=None):
+    """
+    Runs convert_one with each dict of keyword arguments in tasks on a
+    process pool and returns the results in task order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(convert_one, **task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+def workbook_sheets(input_file, engine=None):
+    """
+    Returns the names of the sheets of input_file with a known layout.
+    """
+    if not os.path.isfile(input_file):
+        raise ConversionError(f"Error: File '{input_file}' does not exist.")
+
+    # Imports pandas, see convert_file
+    from structure_detector import detect_sheets
+
+    try:
+        sheets = [name for name, _ in detect_sheets(input_file, engine)]
+    except Exception as e:
+        raise ConversionError(f"Error detecting structure: {e}")
+    if not sheets:
+        raise ConversionError("Error detecting structure: no sheet has a known layout")
+    return sheets
+
+
+def sheet_output_file(input_file, sheet, output_format="csv"):
+    """
+    Returns the output path of one sheet of input_file converted on its
+    own: <input>.<sheet><extension>, with characters that file names
+    cannot hold replaced by '_'.
+    """
     base_name, _ = os.path.splitext(input_file)
-    output_file = base_name + ".csv"
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", sheet).strip()
+    return f"{base_name}.{name}{OUTPUT_FORMATS[output_format]}"
 
-    # Write out the CSV
+
+def convert_workbooks(
+    input_files,
+    mode="merge",
+    stream=False,
+    workers=None,
+    cache=None,
+    timed=False,
+    ledger=None,
+    output_format="csv",
+    engine=None,
+    in_process=False,
+    fx_rates=False,
+):
+    """
+    Converts every sheet with a known layout of each input: with mode
+    'merge' into one output per input, holding the sheets in workbook
+    order, with mode 'split' into one output per sheet next to the input
+    (see sheet_output_file). With a ledger, all sheets are appended to it.
+    The sheets of all inputs are converted in parallel on a process pool,
+    unless in_process is set or a ledger is given.
+    Returns (input, output_file, error, stages) tuples like convert_files:
+    one per input with 'merge', and one per sheet, with the input given
+    as 'input [sheet]', with 'split' or a ledger.
+    """
+    with tempfile.TemporaryDirectory(prefix="bank_statement_sync-sheets-") as tmp:
+        options = dict(
+            stream=stream,
+            cache=cache,
+            timed=timed,
+            ledger=ledger,
+            output_format=output_format,
+            engine=engine,
+            fx_rates=fx_rates,
+        )
+        # One task per sheet; merged inputs first get a part file per sheet.
+        # Each input is planned with its error or its (sheet, task index)
+        tasks = []
+        plans = []
+        for input_file in input_files:
+            try:
+                sheets = workbook_sheets(input_file, engine)
+            except ConversionError as e:
+                plans.append((input_file, str(e), []))
+                continue
+            plans.append((input_file, None, []))
+            for sheet in sheets:
+                if mode == "split":
+                    output_file = sheet_output_file(input_file, sheet, output_format)
+                else:
+                    extension = OUTPUT_FORMATS[output_format]
+                    output_file = os.path.join(tmp, f"part-{len(tasks)}{extension}")
+                plans[-1][2].append((sheet, len(tasks)))
+                tasks.append(
+                    dict(
+                        options,
+                        input_file=input_file,
+                        sheet=sheet,
+                        output_file=output_file,
+                    )
+                )
+
+        if in_process or ledger is not None:
+            outcomes = [convert_one(**task) for task in tasks]
+        else:
+            outcomes = _run_in_pool(tasks, workers)
+
+        results = []
+        for input_file, error, sheets in plans:
+            if error is not None:
+                results.append((input_file, None, error, None))
+            elif mode == "split" or ledger is not None:
+                results.extend(
+                    (f"{input_file} [{sheet}]",) + outcomes[i] for sheet, i in sheets
+                )
+            else:
+                parts = [(sheet,) + outcomes[i] for sheet, i in sheets]
+                results.append(_join_sheets(input_file, parts, output_format, fx_rates))
+        return results
+
+
+def _join_sheets(input_file, parts, output_format, fx_rates=False):
+    """
+    Joins the (sheet, part_file, error, stages) outputs of the sheets of
+    one input into its output file, and their FX rate tables, when
+    fx_rates is set, into its table.
+    """
+    stages = timings.combine(part_stages for _, _, _, part_stages in parts)
+    for sheet, _, error, _ in parts:
+        if error is not None:
+            return input_file, None, f"{error} (sheet '{sheet}')", stages
+
+    from fx_rates import fx_rates_file
+    from output import concat_outputs
+
+    base_name, _ = os.path.splitext(input_file)
+    output_file = base_name + OUTPUT_FORMATS[output_format]
+    part_files = [part_file for _, part_file, _, _ in parts]
     try:
-        write_csv(records, output_file)
+        concat_outputs(part_files, output_file, output_format)
+        if fx_rates:
+            concat_outputs(
+                [fx_rates_file(part_file) for part_file in part_files],
+                fx_rates_file(output_file),
+            )
     except Exception as e:
-        print(f"Error writing CSV: {e}", file=sys.stderr)
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        return input_file, None, f"Error processing file: {e}", stages
+    return input_file, output_file, None, stages
+
+
+def write_timings_report(results, total_seconds, report_file):
+    """
+    Writes the per-file stage timings as JSON to report_file ('-' for stdout).
+    """
+    report = {
+        "tool_version": tool_version(),
+        "total_seconds": total_seconds,
+        "files": [
+            {
+                "input": input_file,
+                "output": output_file,
+                "error": error,
+                "stages": stages,
+            }
+            for input_file, output_file, error, stages in results
+        ],
+    }
+    if report_file == "-":
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def merge_main(argv):
+    """
+    The 'merge' command: merges several statements into one ledger CSV
+    sorted by date and time.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py merge",
+        description="Merge the statements of several accounts into one CSV "
+        "ledger sorted by date and time, with an Account column taken from "
+        "each file name.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        metavar="input_file",
+        help="XLS or XLSX statements of any supported bank; directories and "
+        "glob patterns are expanded",
+    )
+    parser.add_argument(
+        "-o", "--output", required=True, help="Path of the merged ledger CSV"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read the statements row by row instead of loading whole sheets",
+    )
+    _add_engine_argument(parser)
+    args = parser.parse_args(argv)
+    _check_engine_argument(parser, args)
+
+    # Imports pandas, see convert_file
+    from merge import merge_statements
+
+    input_files = expand_inputs(args.inputs)
+    try:
+        written = merge_statements(
+            input_files, args.output, stream=args.stream, engine=args.engine
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
         sys.exit(1)
+    except OSError as e:
+        print(f"Error writing '{args.output}': {e}", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"Merged {written} transactions from {len(input_files)} files "
+        f"into '{args.output}'"
+    )
+
+
+def _add_engine_argument(parser):
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        help="Excel parsing engine; calamine is the fastest and needs "
+        "python-calamine (default: the fastest installed one for each file "
+        "type; openpyxl or xlrd with --stream)",
+    )
+
+
+def _check_engine_argument(parser, args):
+    if args.engine is not None and not is_available(args.engine):
+        package = PACKAGES[args.engine]
+        parser.error(f"--engine {args.engine} needs {package} (pip install {package})")
+
+
+def _add_conversion_arguments(parser):
+    """
+    Adds the options shared by the default command and 'watch'.
+    """
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read the file row by row instead of loading the whole sheet; "
+        "keeps memory flat for very large statements",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes used when converting several files "
+        "(default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=list(OUTPUT_FORMATS),
+        default="csv",
+        help="Output file format; parquet and arrow keep dates and sums typed "
+        "and need pyarrow (default: %(default)s)",
+    )
+    _add_engine_argument(parser)
+    parser.add_argument(
+        "--fx-rates",
+        action="store_true",
+        help="Also write the exchange rates of each statement by day and "
+        "currency to <output>.fx-rates.csv; conversions are not cached then",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always convert, ignoring and not updating the conversion cache",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the conversion cache "
+        "(default: $BANK_STATEMENT_SYNC_CACHE_DIR or ~/.cache/bank_statement_sync)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_SIZE / (1024 * 1024),
+        help="Evict least recently used cache entries above this size (default: %(default)g)",
+    )
+    parser.add_argument(
+        "--cache-max-days",
+        type=float,
+        default=DEFAULT_MAX_AGE / (24 * 60 * 60),
+        help="Evict cache entries not used for this many days (default: %(default)g)",
+    )
+
+
+def _check_conversion_arguments(parser, args):
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    _check_engine_argument(parser, args)
+    if args.output_format != "csv" and importlib.util.find_spec("pyarrow") is None:
+        parser.error(
+            f"--format {args.output_format} needs pyarrow (pip install pyarrow)"
+        )
+
+
+def _make_cache(args):
+    if args.no_cache:
+        return None
+    return ConversionCache(
+        args.cache_dir,
+        max_size=args.cache_max_mb * 1024 * 1024,
+        max_age=args.cache_max_days * 24 * 60 * 60,
+    )
+
+
+def watch_main(argv):
+    """
+    The 'watch' command: converts statements as they appear in a directory
+    until interrupted.
+    """
+    from watch import DEFAULT_INTERVAL, DEFAULT_SETTLE
+
+    parser = argparse.ArgumentParser(
+        prog="main.py watch",
+        description="Watch a directory and convert XLS/XLSX statements as "
+        "they are added or changed, writing each output next to its statement.",
+    )
+    parser.add_argument("directory", help="Directory to watch")
+    _add_conversion_arguments(parser)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Seconds between directory scans (default: %(default)g)",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE,
+        help="Seconds a file must stay unchanged before it is converted, "
+        "so that partially copied files are skipped (default: %(default)g)",
+    )
+    args = parser.parse_args(argv)
+    _check_conversion_arguments(parser, args)
+    if not os.path.isdir(args.directory):
+        parser.error(f"'{args.directory}' is not a directory")
+
+    import asyncio
+    import functools
+    from concurrent.futures import ProcessPoolExecutor
+
+    from watch import FolderWatcher, ignore_interrupts, serve
+
+    cache = _make_cache(args)
+    watcher = FolderWatcher(
+        args.directory,
+        STATEMENT_EXTENSIONS,
+        OUTPUT_FORMATS[args.output_format],
+        settle=args.settle,
+    )
+    convert = functools.partial(
+        convert_one,
+        stream=args.stream,
+        cache=cache,
+        output_format=args.output_format,
+        engine=args.engine,
+        fx_rates=args.fx_rates,
+    )
+    workers = args.workers or os.cpu_count() or 1
+    print(
+        f"Watching '{args.directory}' with {workers} workers, press Ctrl+C to stop",
+        flush=True,
+    )
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=ignore_interrupts
+        ) as executor:
+            asyncio.run(
+                serve(
+                    watcher,
+                    convert,
+                    executor,
+                    workers,
+                    interval=args.interval,
+                    on_result=_print_result,
+                    # Enforce the cache limits while running, not only on exit
+                    maintain=cache.evict if cache is not None else None,
+                )
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache is not None:
+            cache.evict()
+
+
+def _print_result(input_file, output_file, error, out=None):
+    if error is None:
+        print(f"OK      {input_file} -> {output_file}", file=out, flush=True)
+    else:
+        print(f"FAILED  {input_file}: {error}", file=sys.stderr, flush=True)
+
+
+def main():
+    if sys.argv[1:2] == ["merge"]:
+        merge_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["watch"]:
+        watch_main(sys.argv[2:])
+        return
 
-    print(f"Successfully wrote output to '{output_file}'")
+    parser = argparse.ArgumentParser(
+        description="Process XLS/XLSX file and output CSV with Date, Details, and Sum columns.",
+        epilog="To merge several statements into one ledger sorted by date, "
+        "run 'main.py merge --help'; to convert statements as they are added "
+        "to a directory, run 'main.py watch --help'.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        metavar="input_file",
+        help="Path to the input XLS or XLSX file; several files, directories "
+        "or glob patterns may be given to convert them in one run",
+    )
+    _add_conversion_arguments(parser)
+    parser.add_argument(
+        "--incremental",
+        metavar="LEDGER",
+        help="Append only transactions not yet in the LEDGER CSV to it; "
+        "already exported ones are looked up in a compact index kept in "
+        "LEDGER.idx. Inputs are then converted one by one, in the given order",
+    )
+    parser.add_argument(
+        "--sheets",
+        choices=SHEET_MODES,
+        default="first",
+        help="Which sheets to convert: only the first one, or every sheet "
+        "with a known layout, each converted in its own worker; merge writes "
+        "them into one output in sheet order, split writes one output per "
+        "sheet named <input>.<sheet>.csv (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--timings",
+        metavar="REPORT",
+        help="Write a JSON report with per-file time and row counts for "
+        "detection, Excel parsing, processing and CSV writing ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Run under cProfile and dump the stats to FILE (for pstats or "
+        "snakeviz); several files are then converted in-process, one by one",
+    )
+    args = parser.parse_args()
+
+    _check_conversion_arguments(parser, args)
+    if args.incremental and args.output_format != "csv":
+        parser.error("--incremental only supports --format csv")
+    if args.incremental and args.fx_rates:
+        parser.error("--fx-rates cannot be combined with --incremental")
+    if args.timings == "-":
+        # The report is the only output on stdout, so it can be piped
+        _log_to_stderr()
+    cache = _make_cache(args)
+
+    try:
+        run(args, cache)
+    finally:
+        if cache is not None:
+            cache.evict()
+
+
+def _log_to_stderr():
+    """
+    Moves the log handlers that write to stdout over to stderr.
+    """
+    for handler in logging.getLogger().handlers:
+        if getattr(handler, "stream", None) is sys.stdout:
+            handler.setStream(sys.stderr)
+
+
+def run(args, cache):
+    """
+    Converts the inputs given on the command line and reports the result.
+    """
+    input_files = expand_inputs(args.inputs)
+    timed = args.timings is not None
+    ledger = LedgerIndex.load(args.incremental) if args.incremental else None
+
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    start = time.perf_counter()
+    # Sheets are converted in parallel even for a single workbook
+    if args.sheets != "first":
+        results = convert_workbooks(
+            input_files,
+            args.sheets,
+            stream=args.stream,
+            workers=args.workers,
+            cache=cache,
+            timed=timed,
+            ledger=ledger,
+            output_format=args.output_format,
+            engine=args.engine,
+            in_process=profiler is not None,
+            fx_rates=args.fx_rates,
+        )
+    # A single file, any run under the profiler and incremental runs, which
+    # all append to one ledger, are converted in-process
+    elif len(input_files) == 1 or profiler is not None or ledger is not None:
+        results = [
+            (input_file,)
+            + convert_one(
+                input_file,
+                stream=args.stream,
+                cache=cache,
+                timed=timed,
+                ledger=ledger,
+                output_format=args.output_format,
+                engine=args.engine,
+                fx_rates=args.fx_rates,
+            )
+            for input_file in input_files
+        ]
+    else:
+        results = convert_files(
+            input_files,
+            stream=args.stream,
+            workers=args.workers,
+            cache=cache,
+            timed=timed,
+            output_format=args.output_format,
+            engine=args.engine,
+            fx_rates=args.fx_rates,
+        )
+    total_seconds = time.perf_counter() - start
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+    if timed:
+        write_timings_report(results, total_seconds, args.timings)
+
+    # Messages go to stderr when stdout holds the timings report
+    out = sys.stderr if args.timings == "-" else sys.stdout
+    if len(results) == 1:
+        _, output_file, error, _ = results[0]
+        if error is not None:
+            print(error, file=sys.stderr)
+            sys.exit(1)
+        print(f"Successfully wrote output to '{output_file}'", file=out)
+        return
+
+    # Per-file summary
+    failed = 0
+    for input_file, output_file, error, _ in results:
+        if error is not None:
+            failed += 1
+        _print_result(input_file, output_file, error, out)
+    print(
+        f"Converted {len(results) - failed} of {len(results)} files, {failed} failed",
+        file=out,
+    )
+
+    if failed == len(results):
+        sys.exit(1)
+    if failed:
+        sys.exit(EXIT_PARTIAL_FAILURE)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+import csv
+import heapq
+import os
+import tempfile
+from contextlib import ExitStack
+from itertools import islice
+from operator import itemgetter
+
+from output import write_rows
+from registry import load_processor
+from structure_detector import detect_structure
+from workbook import Workbook
+
+# Records sorted in memory at a time before they are spilled to a run file
+RUN_SIZE = 100000
+
+# Run files merged at a time; with more runs they are merged in several
+# passes, so the number of open files stays bounded
+MAX_FAN_IN = 64
+
+# Columns of the merged ledger
+MERGED_FIELDNAMES = ("Date", "Details", "Sum", "Account")
+
+# Run file rows are (date, time, details, sum, account)
+_SORT_KEY = itemgetter(0, 1)
+
+
+def account_name(input_file):
+    """
+    Returns the account a statement belongs to: its file name without
+    the extension.
+    """
+    return os.path.splitext(os.path.basename(input_file))[0]
+
+
+def iter_statement(input_file, stream=False, engine=None):
+    """
+    Detects the layout of a statement and yields its records.
+    """
+    if not os.path.isfile(input_file):
+        raise ValueError(f"File '{input_file}' does not exist.")
+    workbook = Workbook(input_file, streaming=stream, engine=engine)
+    processor = load_processor(detect_structure(workbook))
+    return processor.stream(workbook) if stream else processor.iter_records(workbook)
+
+
+def merge_statements(
+    input_files,
+    output_file,
+    stream=False,
+    run_size=RUN_SIZE,
+    engine=None,
+    fan_in=MAX_FAN_IN,
+):
+    """
+    Merges the statements of several accounts, of any known layout, into
+    one CSV ledger sorted by date and time, with an Account column.
+    Each statement is sorted run_size records at a time into temporary
+    run files, which are then k-way merged, at most fan_in at a time;
+    memory use and open files depend on run_size and fan_in, not on the
+    number of records or statements.
+    Records with the same date and time keep the input order.
+    engine picks the Excel parsing engine (see engines.py).
+    Returns the number of records written.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    with tempfile.TemporaryDirectory(prefix="bank_statement_sync-merge-") as tmp:
+        runs = []
+        for input_file in input_files:
+            account = account_name(input_file)
+            try:
+                records = iter_statement(input_file, stream, engine)
+                while True:
+                    chunk = list(islice(records, run_size))
+                    if not chunk:
+                        break
+                    rows = [
+                        (rec.date, rec.time, rec.details, rec.sum, account)
+                        for rec in chunk
+                    ]
+                    rows.sort(key=_SORT_KEY)
+                    runs.append(_write_run(rows, tmp, len(runs)))
+            except Exception as e:
+                raise ValueError(f"Error merging '{input_file}': {e}")
+
+        # Merging consecutive runs keeps ties in input order
+        number = len(runs)
+        while len(runs) > fan_in:
+            merged_runs = []
+            for start in range(0, len(runs), fan_in):
+                with ExitStack() as stack:
+                    merged = _merge_runs(runs[start : start + fan_in], stack)
+                    merged_runs.append(_write_run(merged, tmp, number))
+                number += 1
+                for path in runs[start : start + fan_in]:
+                    os.remove(path)
+            runs = merged_runs
+
+        with ExitStack() as stack:
+            return write_rows(
+                (
+                    (date, details, sum_str, account)
+                    for date, _, details, sum_str, account in _merge_runs(runs, stack)
+                ),
+                output_file,
+                fieldnames=MERGED_FIELDNAMES,
+            )
+
+
+def _merge_runs(paths, stack):
+    # Opens the run files on stack and yields their rows in sort order
+    files = [
+        stack.enter_context(open(path, newline="", encoding="utf-8")) for path in paths
+    ]
+    return heapq.merge(*(csv.reader(f) for f in files), key=_SORT_KEY)
+
+
+def _write_run(rows, directory, number):
+    path = os.path.join(directory, f"run-{number}.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    return path
@@ -0,0 +1,84 @@
+import math
+
+# numpy is only imported by the *_column functions: transaction.py uses
+# the scalar helpers, and main.py imports it through output.py and
+# ledger_index.py without paying for numpy at start-up
+
+# Minor units (kopiyky, cents) per currency unit
+MINOR_PER_UNIT = 100
+
+
+def to_minor(value):
+    """
+    Converts an amount cell (float, int or numeric text) to integer minor
+    units, rounding half to even. Cells hold amounts with two decimals,
+    so the result is exact. An empty (NaN) cell counts as zero.
+    """
+    value = float(value)
+    if math.isnan(value):
+        return 0
+    return int(round(value * MINOR_PER_UNIT))
+
+
+def to_minor_column(values):
+    """
+    Vectorized to_minor; returns an int64 array.
+    """
+    import numpy as np
+
+    scaled = np.asarray(values, dtype=float) * MINOR_PER_UNIT
+    return np.rint(np.nan_to_num(scaled, nan=0.0)).astype(np.int64)
+
+
+# Below this many minor units, minor / 100 is the double closest to the
+# exact amount, far closer than half a cent, so %.2f prints its exact digits
+_FLOAT_EXACT_MINOR = 10**15
+
+
+def format_minor(minor):
+    """
+    Formats minor units as a signed amount with two decimals, e.g. -1234
+    as '-12.34'. Zero is always '0.00', never '-0.00'.
+    """
+    if -_FLOAT_EXACT_MINOR < minor < _FLOAT_EXACT_MINOR:
+        # %-formatting a float is about twice as fast as the divmod below;
+        # an int zero divides to +0.0, so there is no '-0.00'
+        return "%.2f" % (minor / MINOR_PER_UNIT)
+    units, cents = divmod(abs(minor), MINOR_PER_UNIT)
+    sign = "-" if minor < 0 else ""
+    return f"{sign}{units}.{cents:02d}"
+
+
+def rate_minor(numerator, denominator):
+    """
+    Returns numerator / denominator, both in minor units, as an exchange
+    rate in hundredths rounded half to even, or 0 when the denominator is
+    zero. Uses integer arithmetic only.
+    """
+    if denominator == 0:
+        return 0
+    negative = (numerator < 0) != (denominator < 0)
+    quotient, remainder = divmod(abs(numerator) * MINOR_PER_UNIT, abs(denominator))
+    twice = 2 * remainder
+    if twice > abs(denominator) or (twice == abs(denominator) and quotient % 2):
+        quotient += 1
+    return -quotient if negative else quotient
+
+
+def rate_minor_column(numerator, denominator):
+    """
+    Vectorized rate_minor on int64 arrays; returns an int64 array.
+    """
+    import numpy as np
+
+    numerator = np.asarray(numerator, dtype=np.int64)
+    denominator = np.asarray(denominator, dtype=np.int64)
+    negative = (numerator < 0) != (denominator < 0)
+    dividend = np.abs(numerator) * MINOR_PER_UNIT
+    divisor = np.abs(denominator)
+    safe = np.where(divisor == 0, 1, divisor)
+    quotient, remainder = np.divmod(dividend, safe)
+    twice = 2 * remainder
+    quotient += (twice > divisor) | ((twice == divisor) & (quotient % 2 == 1))
+    quotient = np.where(negative, -quotient, quotient)
+    return np.where(divisor == 0, 0, quotient)
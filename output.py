@@ -1,13 +1,200 @@
 import csv
+import shutil
+from decimal import Decimal
+from itertools import islice
 
+from transaction import record_row
 
-def write_csv(records, output_file):
+# Number of rows written before the file buffer is flushed
+CHUNK_SIZE = 10000
+
+# Size of the file buffer used when writing CSV
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Columns of the CSV output
+FIELDNAMES = ("Date", "Details", "Sum")
+
+# Output formats and their file extensions; parquet and arrow need pyarrow
+OUTPUT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def write_csv(records, output_file, chunk_size=CHUNK_SIZE, append=False):
+    """
+    Writes records to CSV.
+    Each record is a Transaction, or a dict with keys: 'Date', 'Details',
+    'Sum'; a Transaction's Details and Sum are formatted here.
+    Records may be any iterable, including a generator; they are consumed
+    and flushed to disk chunk_size at a time, so output appears as soon
+    as the first chunk is ready.
+    With append set, records are added to the end of an existing file and
+    the header is only written when the file is new or empty.
+    Returns the number of records written.
+    """
+    return write_rows(map(record_row, records), output_file, chunk_size, append)
+
+
+def write_rows(
+    rows, output_file, chunk_size=CHUNK_SIZE, append=False, fieldnames=FIELDNAMES
+):
+    """
+    Writes (date, details, sum) tuples to CSV, byte for byte like
+    write_csv, without building a dict per row. Column arrays can be
+    passed as zip(dates, details, sums). Rows with other columns need
+    matching fieldnames.
+    Rows are written chunk_size at a time with a single writerows call
+    through a large file buffer.
+    Returns the number of rows written.
+    """
+    mode = "a" if append else "w"
+    with open(
+        output_file, mode, newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE
+    ) as f:
+        writer = csv.writer(f)
+        if f.tell() == 0:
+            writer.writerow(fieldnames)
+        rows = iter(rows)
+        written = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            f.flush()
+            written += len(chunk)
+    return written
+
+
+def write_output(records, output_file, output_format="csv", chunk_size=CHUNK_SIZE):
+    """
+    Writes records in one of OUTPUT_FORMATS and returns the number written.
+    """
+    if output_format == "csv":
+        return write_csv(records, output_file, chunk_size)
+    if output_format in ("parquet", "arrow"):
+        return write_columnar(records, output_file, output_format, chunk_size)
+    raise ValueError(f"Unknown output format '{output_format}'.")
+
+
+def concat_outputs(part_files, output_file, output_format="csv"):
+    """
+    Joins files written by write_output in the same output_format into
+    output_file, in the given order. CSV parts are copied byte for byte
+    after their header line; Parquet and Arrow parts are copied batch by
+    batch, so no part is loaded as a whole.
+    """
+    if output_format == "csv":
+        with open(output_file, "wb") as out:
+            for i, part_file in enumerate(part_files):
+                with open(part_file, "rb") as part:
+                    header = part.readline()
+                    if i == 0:
+                        out.write(header)
+                    shutil.copyfileobj(part, out, WRITE_BUFFER_SIZE)
+        return
+    if output_format not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown output format '{output_format}'.")
+    pa = _import_pyarrow()
+    with _table_writer(pa, output_file, output_format) as writer:
+        for part_file in part_files:
+            for batch in _iter_batches(pa, part_file, output_format):
+                writer.write_batch(batch)
+
+
+def _iter_batches(pa, part_file, output_format):
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+
+        yield from pq.ParquetFile(part_file).iter_batches()
+        return
+    with pa.memory_map(part_file) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+
+def write_columnar(
+    records, output_file, output_format="parquet", chunk_size=CHUNK_SIZE
+):
     """
-    Writes a list of records to CSV.
-    Each record must be a dict with keys: 'Date', 'Details', 'Sum'.
+    Writes records to a Parquet or an Arrow IPC file (output_format
+    'parquet' or 'arrow') with typed columns: Date as date32, Details as
+    string and Sum as decimal128(18, 2).
+    Records are Transactions or dicts like for write_csv, or a DataFrame
+    with Date, Details and Sum columns. The Arrow file is written uncompressed so
+    that readers can memory-map it.
+    Needs pyarrow, which is imported only here.
+    Returns the number of records written.
     """
-    with open(output_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["Date", "Details", "Sum"])
-        writer.writeheader()
-        for rec in records:
-            writer.writerow(rec)
+    pa = _import_pyarrow()
+    written = 0
+    with _table_writer(pa, output_file, output_format) as writer:
+        for dates, details, sums in _iter_column_chunks(records, chunk_size):
+            writer.write_table(_table(pa, dates, details, sums))
+            written += len(dates)
+    return written
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Parquet and Arrow output need pyarrow; install it with "
+            "'pip install pyarrow'"
+        )
+    return pyarrow
+
+
+def _schema(pa):
+    return pa.schema(
+        [
+            ("Date", pa.date32()),
+            ("Details", pa.string()),
+            ("Sum", pa.decimal128(18, 2)),
+        ]
+    )
+
+
+def _table_writer(pa, output_file, output_format):
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(output_file, _schema(pa))
+    return pa.ipc.new_file(output_file, _schema(pa))
+
+
+def _iter_column_chunks(records, chunk_size):
+    """
+    Yields (dates, details, sums) lists of at most chunk_size values.
+    """
+    if hasattr(records, "columns"):
+        for start in range(0, len(records), chunk_size):
+            part = records.iloc[start : start + chunk_size]
+            yield part["Date"].tolist(), part["Details"].tolist(), part["Sum"].tolist()
+        return
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        dates, details, sums = zip(*map(record_row, chunk))
+        yield list(dates), list(details), list(sums)
+
+
+def _table(pa, dates, details, sums):
+    import pyarrow.compute as pc
+
+    dates = pa.array(dates)
+    if pa.types.is_string(dates.type):
+        # Processors format dates as yyyy/mm/dd
+        dates = pc.strptime(dates, format="%Y/%m/%d", unit="s")
+    # Sums are formatted with two decimals, so the conversion is exact
+    sums = [Decimal(s if isinstance(s, str) else f"{s:.2f}") for s in sums]
+    return pa.Table.from_arrays(
+        [
+            dates.cast(pa.date32()),
+            pa.array(details, type=pa.string()),
+            pa.array(sums, type=pa.decimal128(18, 2)),
+        ],
+        schema=_schema(pa),
+    )
@@ -1,45 +1,184 @@
 # processor_privat.py
+import sys
+
+import numpy as np
 import pandas as pd
 
+from columnar import (
+    CHUNK_SIZE,
+    as_text,
+    interned,
+    iter_chunks,
+    sparse_list,
+    to_datetime_column,
+)
+from dates import parse_date_time
+from money import rate_minor, rate_minor_column, to_minor, to_minor_column
+from transaction import Transaction
+from workbook import iter_mapped_rows, open_workbook
+
+# Text in cell A1 that identifies Privat statements; read by registry.py
+# without importing this module
+SIGNATURE = "Виписка з Ваших карток за період"
+
+# Format of the operation date and time (day first)
+DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+# The first row holds the statement title; the column headers follow
+HEADER_ROW = 1
+
+# Columns used and their dtypes; the card number and balance columns of
+# the export are not parsed
+COLUMNS = {
+    "Дата": object,
+    "Категорія": object,
+    "Опис операції": object,
+    "Сума в валюті картки": "float64",
+    "Валюта картки": object,
+    "Сума в валюті транзакції": "float64",
+    "Валюта транзакції": object,
+}
+
+
+def process(source):
+    """
+    Processes a type1 XLS/XLSX file (path or Workbook) and returns a list
+    of Transaction records.
+    """
+    return list(iter_records(source))
+
+
+def iter_records(source, chunk_size=CHUNK_SIZE):
+    """
+    Yields the records of process() chunk by chunk, so at most chunk_size
+    records exist at a time.
+    """
+    df = open_workbook(source).frame(HEADER_ROW, COLUMNS)
+    # Only matching columns are read, so a wrong header row leaves no
+    # columns (and no rows) instead of failing on the first record
+    if "Дата" not in df.columns:
+        raise KeyError("Дата")
+    for chunk in iter_chunks(df, chunk_size):
+        yield from _process_columns(chunk)
+
+
+def stream(source):
+    """
+    Yields the same records as process() one at a time while reading the
+    file row by row, so memory use does not grow with the statement size.
+    """
+    rows = open_workbook(source).rows()
+    # Skip the first row; header on second row
+    next(rows, None)
+    header = next(rows, None)
+    if header is None:
+        return
+    for row in iter_mapped_rows(rows, header):
+        record = _row_to_record(row)
+        if record is not None:
+            yield record
+
 
-def process(input_file):
+def _process_columns(df):
     """
-    Processes a type1 XLS/XLSX file and returns a list of records,
-    each record is a dict with keys: Date (yyyy/mm/dd), Details, Sum.
+    Columnar implementation: builds the Transaction fields for the whole
+    DataFrame with column operations instead of a per-row loop.
+    Produces the same records as _process_rows.
+    """
+    # Skip rows without a date
+    df = df[df["Дата"].notna()]
+    if df.empty:
+        return []
+
+    # Parse date and time for the whole column at once
+    dt = to_datetime_column(df["Дата"], dayfirst=True, format=DATE_FORMAT)
+    dates = dt.dt.strftime("%Y/%m/%d").tolist()
+    times = dt.dt.strftime("%H:%M:%S").tolist()
+
+    # Description and optional category
+    descriptions = as_text(df["Опис операції"]).tolist()
+    categories = [""] * len(df)
+    if "Категорія" in df.columns:
+        category = df["Категорія"]
+        category_text = as_text(category)
+        has_category = category.notna() & (category_text.str.strip() != "")
+        categories = interned(category_text.where(has_category, ""))
+
+    # Currency conversion info if currencies differ
+    converted = (df["Валюта картки"] != df["Валюта транзакції"]).to_numpy()
+    originals = currencies = rates = [None] * len(df)
+    if converted.any():
+        conv = df[converted]
+        sum_trans = to_minor_column(conv["Сума в валюті транзакції"])
+        sum_card = to_minor_column(conv["Сума в валюті картки"])
+        rate = rate_minor_column(np.abs(sum_card), np.abs(sum_trans))
+        originals = sparse_list(converted, sum_trans.tolist())
+        currencies = sparse_list(
+            converted, interned(as_text(conv["Валюта транзакції"]))
+        )
+        rates = sparse_list(converted, rate.tolist())
+
+    # Signed amount in exact minor units
+    amounts = to_minor_column(df["Сума в валюті картки"]).tolist()
+
+    return [
+        Transaction(*fields)
+        for fields in zip(
+            dates,
+            times,
+            descriptions,
+            categories,
+            amounts,
+            originals,
+            currencies,
+            rates,
+        )
+    ]
+
+
+def _process_rows(df):
+    """
+    Reference per-row implementation, kept to check the columnar path.
     """
-    # Read the file, skipping the first row; header on second row (index=1)
-    df = pd.read_excel(input_file, header=1)
     records = []
     for _, row in df.iterrows():
-        # Skip rows without a date
-        dt_raw = row["Дата"]
-        if pd.isna(dt_raw):
-            continue
-        # Parse date and time
-        dt = pd.to_datetime(dt_raw, dayfirst=True)
-        date_str = dt.strftime("%Y/%m/%d")
-        time_str = dt.strftime("%H:%M:%S")
-
-        # Start building Details
-        details = str(row["Опис операції"])
-        category = row.get("Категорія")
-        if pd.notna(category) and str(category).strip():
-            details += f" <{category}>"
-        details += f" {time_str}"
-
-        # Append currency conversion info if currencies differ
-        curr_card = row["Валюта картки"]
-        curr_trans = row["Валюта транзакції"]
-        if curr_card != curr_trans:
-            sum_trans = float(row["Сума в валюті транзакції"])
-            sum_card = float(row["Сума в валюті картки"])
-            rate = abs(sum_card) / abs(sum_trans) if sum_trans != 0 else 0
-            details += f" ({sum_trans:.2f} {curr_trans} @ {rate:.2f})"
-
-        # Prepare Sum field (with sign, 2 decimals)
-        sum_value = float(row["Сума в валюті картки"])
-        sum_str = f"{sum_value:.2f}"
-
-        records.append({"Date": date_str, "Details": details, "Sum": sum_str})
-
+        record = _row_to_record(row)
+        if record is not None:
+            records.append(record)
     return records
+
+
+def _row_to_record(row):
+    """
+    Builds one Transaction from a row mapping column names to cell values.
+    Returns None for rows without a date.
+    """
+    # Skip rows without a date
+    dt_raw = row["Дата"]
+    if pd.isna(dt_raw):
+        return None
+    # Parse date and time
+    date_str, time_str = parse_date_time(dt_raw, DATE_FORMAT, dayfirst=True)
+
+    # Description and optional category
+    category = row.get("Категорія")
+    if pd.isna(category) or not str(category).strip():
+        category = ""
+    transaction = Transaction(
+        date_str,
+        time_str,
+        str(row["Опис операції"]),
+        sys.intern(str(category)),
+        to_minor(row["Сума в валюті картки"]),
+    )
+
+    # Currency conversion info if currencies differ
+    curr_card = row["Валюта картки"]
+    curr_trans = row["Валюта транзакції"]
+    if curr_card != curr_trans:
+        sum_trans = to_minor(row["Сума в валюті транзакції"])
+        transaction.original_amount = sum_trans
+        transaction.original_currency = sys.intern(str(curr_trans))
+        transaction.fx_rate = rate_minor(abs(transaction.amount), abs(sum_trans))
+
+    return transaction
@@ -1,67 +1,207 @@
+import sys
+
+import numpy as np
 import pandas as pd
 
+from columnar import (
+    CHUNK_SIZE,
+    as_text,
+    interned,
+    iter_chunks,
+    sparse_list,
+    to_datetime_column,
+)
+from dates import parse_date_time
+from money import rate_minor, rate_minor_column, to_minor, to_minor_column
+from transaction import Transaction
+from workbook import iter_mapped_rows, open_workbook
+
+# Text in cell A1 that identifies Raiffeisen statements; read by
+# registry.py without importing this module
+SIGNATURE = "АТ «Райффайзен Банк»"
+
+HEADER_NAME = "Дата і час здійснення операції"
+
+# Format of the operation date and time (month first)
+DATE_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+# Categories whose sums keep their sign; everything else is an expense
+INCOME_CATEGORIES = ("Повернення", "Поповнення", "Кешбек")
+
+# Columns used and their dtypes; the processing date, card number and
+# balance columns of the export are not kept
+COLUMNS = {
+    HEADER_NAME: object,
+    "Деталі операції": object,
+    "Сума у валюті операції": "float64",
+    "Валюта": object,
+    "Сума у валюті рахунку": "float64",
+    "Сума кешбеку": "float64",
+}
+
+
+def process(source):
+    """
+    Processes a type2 XLS/XLSX file (path or Workbook) and returns a list
+    of Transaction records.
+    """
+    return list(iter_records(source))
+
 
-def process(input_file):
+def iter_records(source, chunk_size=CHUNK_SIZE):
     """
-    Processes a type2 XLS/XLSX file and returns a list of records,
-    each record is a dict with keys: Date (yyyy/mm/dd), Details, Sum.
+    Yields the records of process() chunk by chunk, so at most chunk_size
+    records exist at a time.
     """
-    # First, find the header row by looking for the known header string
-    df0 = pd.read_excel(input_file, header=None)
-    header_name = "Дата і час здійснення операції"
-    header_rows = df0.index[df0.iloc[:, 0] == header_name].tolist()
+    # Find the header row in the parsed sheet by looking for the known
+    # header string
+    workbook = open_workbook(source)
+    df0 = workbook.sheet
+    header_rows = df0.index[df0.iloc[:, 0] == HEADER_NAME].tolist()
     if not header_rows:
         raise ValueError("Header row not found in type2 file")
-    header_idx = header_rows[0]
 
-    # Read the data with proper header
-    df = pd.read_excel(input_file, header=header_idx)
+    # Build the data frame of the used columns from the same parse
+    df = workbook.frame(header_rows[0], COLUMNS)
+    for chunk in iter_chunks(df, chunk_size):
+        yield from _process_columns(chunk)
+
+
+def stream(source):
+    """
+    Yields the same records as process() one at a time while reading the
+    file row by row, so memory use does not grow with the statement size.
+    """
+    rows = open_workbook(source).rows()
+    # Skip everything up to and including the header row
+    for header in rows:
+        if header and header[0] == HEADER_NAME:
+            break
+    else:
+        raise ValueError("Header row not found in type2 file")
+    for row in iter_mapped_rows(rows, header):
+        record = _row_to_record(row)
+        if record is not None:
+            yield record
+
+
+def _process_columns(df):
+    """
+    Columnar implementation: splits categories, applies sign rules and
+    collects FX and cashback fields for the whole DataFrame at once.
+    Produces the same records as _process_rows.
+    """
+    df = df[df[HEADER_NAME].notna()]
+    if df.empty:
+        return []
+
+    # Parse date and time for the whole column at once
+    dt = to_datetime_column(df[HEADER_NAME], dayfirst=False, format=DATE_FORMAT)
+    dates = dt.dt.strftime("%Y/%m/%d").tolist()
+    times = dt.dt.strftime("%H:%M:%S").tolist()
+
+    # Parse main text and category from 'Деталі операції'
+    raw_det = as_text(df["Деталі операції"])
+    parts = raw_det.str.partition(":")
+    has_colon = parts[1] != ""
+    category = parts[0].str.strip().where(has_colon, "")
+    main_text = parts[2].str.strip().where(has_colon, raw_det)
+
+    # Currency conversion info if Валюта exists
+    originals = currencies = rates = [None] * len(df)
+    if "Валюта" in df.columns:
+        curr = df["Валюта"]
+        foreign = (curr.notna() & (as_text(curr).str.strip() != "UAH")).to_numpy()
+        if foreign.any():
+            fx = df[foreign]
+            sum_oper = to_minor_column(fx["Сума у валюті операції"])
+            sum_acc = to_minor_column(fx["Сума у валюті рахунку"])
+            rate = rate_minor_column(sum_acc, sum_oper)
+            originals = sparse_list(foreign, sum_oper.tolist())
+            currencies = sparse_list(foreign, interned(as_text(fx["Валюта"])))
+            rates = sparse_list(foreign, rate.tolist())
+
+    # Cashback info if present
+    cashbacks = [None] * len(df)
+    if "Сума кешбеку" in df.columns:
+        cashback = df["Сума кешбеку"]
+        present = cashback.notna().to_numpy()
+        minor = to_minor_column(cashback[present])
+        cashbacks = sparse_list(present, [m if m else None for m in minor.tolist()])
+
+    # Sum logic, in exact minor units
+    sum_value = to_minor_column(df["Сума у валюті рахунку"])
+    amounts = np.where(
+        category.isin(INCOME_CATEGORIES).to_numpy(), sum_value, -np.abs(sum_value)
+    ).tolist()
+
+    return [
+        Transaction(*fields)
+        for fields in zip(
+            dates,
+            times,
+            main_text.tolist(),
+            interned(category),
+            amounts,
+            originals,
+            currencies,
+            rates,
+            cashbacks,
+        )
+    ]
+
+
+def _process_rows(df):
+    """
+    Reference per-row implementation, kept to check the columnar path.
+    """
     records = []
     for _, row in df.iterrows():
-        dt_raw = row["Дата і час здійснення операції"]
-        if pd.isna(dt_raw):
-            continue
-        # Parse date and time
-        dt = pd.to_datetime(dt_raw, dayfirst=False)
-        date_str = dt.strftime("%Y/%m/%d")
-        time_str = dt.strftime("%H:%M:%S")
-
-        # Parse main text and category from 'Деталі операції'
-        raw_det = str(row["Деталі операції"])
-        if ":" in raw_det:
-            cat, rest = raw_det.split(":", 1)
-            category = cat.strip()
-            main_text = rest.strip()
-        else:
-            category = ""
-            main_text = raw_det
-
-        details = main_text
-        if category:
-            details += f" <{category}>"
-        details += f" {time_str}"
-
-        # Currency conversion info if Валюта exists
-        curr = row.get("Валюта")
-        if pd.notna(curr) and str(curr).strip() != "UAH":
-            sum_oper = float(row["Сума у валюті операції"])
-            sum_acc = float(row["Сума у валюті рахунку"])
-            rate = sum_acc / sum_oper if sum_oper != 0 else 0
-            details += f" ({sum_oper:.2f} {curr} @ {rate:.2f})"
-
-        # Cashback info if present
-        cashback = row.get("Сума кешбеку")
-        if pd.notna(cashback) and float(cashback) != 0:
-            details += f" [cashback {float(cashback):.2f}]"
-
-        # Sum logic
-        sum_value = float(row["Сума у валюті рахунку"])
-        if category in ("Повернення", "Поповнення", "Кешбек"):
-            out_sum = sum_value
-        else:
-            out_sum = -abs(sum_value)
-        sum_str = f"{out_sum:.2f}"
-
-        records.append({"Date": date_str, "Details": details, "Sum": sum_str})
-
+        record = _row_to_record(row)
+        if record is not None:
+            records.append(record)
     return records
+
+
+def _row_to_record(row):
+    """
+    Builds one Transaction from a row mapping column names to cell values.
+    Returns None for rows without a date.
+    """
+    dt_raw = row[HEADER_NAME]
+    if pd.isna(dt_raw):
+        return None
+    # Parse date and time
+    date_str, time_str = parse_date_time(dt_raw, DATE_FORMAT, dayfirst=False)
+
+    # Parse main text and category from 'Деталі операції'
+    raw_det = str(row["Деталі операції"])
+    if ":" in raw_det:
+        cat, rest = raw_det.split(":", 1)
+        category = sys.intern(cat.strip())
+        main_text = rest.strip()
+    else:
+        category = ""
+        main_text = raw_det
+
+    # Sum logic, in exact minor units
+    sum_value = to_minor(row["Сума у валюті рахунку"])
+    if category not in INCOME_CATEGORIES:
+        sum_value = -abs(sum_value)
+    transaction = Transaction(date_str, time_str, main_text, category, sum_value)
+
+    # Currency conversion info if Валюта exists
+    curr = row.get("Валюта")
+    if pd.notna(curr) and str(curr).strip() != "UAH":
+        sum_oper = to_minor(row["Сума у валюті операції"])
+        sum_acc = to_minor(row["Сума у валюті рахунку"])
+        transaction.original_amount = sum_oper
+        transaction.original_currency = sys.intern(str(curr))
+        transaction.fx_rate = rate_minor(sum_acc, sum_oper)
+
+    # Cashback info if present
+    cashback = row.get("Сума кешбеку")
+    if pd.notna(cashback) and to_minor(cashback) != 0:
+        transaction.cashback = to_minor(cashback)
+
+    return transaction
@@ -0,0 +1,79 @@
+import ast
+import glob
+import importlib
+import os
+import re
+
+# Processor modules are named processor_<structure>.py and live next to
+# this file. Each declares SIGNATURE, the text that identifies its
+# statements in cell A1, and provides process(), iter_records() and stream().
+MODULE_PREFIX = "processor_"
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_signatures = None
+_pattern = None
+_modules = {}
+
+
+def signatures():
+    """
+    Returns a dict mapping structure names to their signatures.
+    Processor modules are found by file name and their SIGNATURE is read
+    from the source without importing them, so pandas and the processing
+    code are not loaded just to detect a layout.
+    """
+    global _signatures
+    if _signatures is None:
+        found = {}
+        pattern = os.path.join(_ROOT, MODULE_PREFIX + "*.py")
+        for path in sorted(glob.glob(pattern)):
+            name = os.path.basename(path)[len(MODULE_PREFIX) : -len(".py")]
+            signature = _read_signature(path)
+            if signature:
+                found[name] = signature
+        _signatures = found
+    return _signatures
+
+
+def _read_signature(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "SIGNATURE"
+            for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    return None
+
+
+def detect(text):
+    """
+    Returns the name of the structure whose signature occurs in text,
+    or None. All registered signatures are checked in a single regex pass.
+    """
+    global _pattern
+    if not isinstance(text, str):
+        return None
+    if _pattern is None:
+        _pattern = re.compile(
+            "|".join(
+                f"(?P<{name}>{re.escape(signature)})"
+                for name, signature in signatures().items()
+            )
+        )
+    match = _pattern.search(text)
+    return match.lastgroup if match else None
+
+
+def load_processor(name):
+    """
+    Imports and returns the processor module for a structure name.
+    Only the module that is actually needed gets imported.
+    """
+    if name not in signatures():
+        raise ValueError(f"Unknown structure '{name}'.")
+    if name not in _modules:
+        _modules[name] = importlib.import_module(MODULE_PREFIX + name)
+    return _modules[name]
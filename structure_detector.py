@@ -1,21 +1,65 @@
 import pandas as pd
 
+import timings
+from engines import choose_engine
+from fast_detector import read_first_cell
+from registry import detect
+from workbook import Workbook, sheet_names
 
-def detect_structure(input_file):
+
+def detect_structure(source):
+    """
+    Detects the statement layout, e.g. privat (Privat) or raif
+    (Raiffeisen), by matching cell A1 against the signatures of all
+    registered processors.
+    Accepts a file path or a Workbook; a Workbook keeps its parsed sheet
+    for the processor that runs next.
+    Cell A1 is first read straight from the file without pandas; the
+    pandas path is only used when that fast read is unsure.
+    Returns the structure name, e.g. 'privat' or 'raif'.
     """
-    Detects whether the input file is privat (Privat) or raif (Raiffeisen)
-    by checking the unique first-row markers.
-    Returns 'privat' or 'raif'.
+    if isinstance(source, Workbook):
+        first_cell = read_first_cell(source.path, source.sheet_name)
+    else:
+        first_cell = read_first_cell(source)
+    if first_cell is None:
+        first_cell = _read_first_cell_pandas(source)
+    structure = detect(first_cell)
+    if structure is not None:
+        return structure
+    raise ValueError(f"Unknown file structure: {first_cell}")
+
+
+def detect_sheets(path, engine=None):
     """
-    # Read only the first cell of the first row
-    df0 = pd.read_excel(input_file, header=None, nrows=1)
+    Detects the layout of every sheet of a workbook, e.g. when each card
+    or account of an export is on its own sheet.
+    Returns a list of (sheet name, structure) pairs in workbook order for
+    the sheets with a known layout; other sheets, such as summaries, are
+    left out.
+    """
+    found = []
+    for name in sheet_names(path, engine):
+        # Streaming, so that an unsure fast read falls back to reading the
+        # first row only rather than parsing the whole sheet
+        workbook = Workbook(path, streaming=True, engine=engine, sheet=name)
+        try:
+            structure = detect_structure(workbook)
+        except ValueError:
+            continue
+        found.append((name, structure))
+    return found
+
+
+def _read_first_cell_pandas(source):
     try:
-        first_cell = df0.iloc[0, 0]
+        if isinstance(source, Workbook):
+            return source.first_row()[0]
+        # Read only the first cell of the first row
+        with timings.stage("read_excel"):
+            df0 = pd.read_excel(
+                source, header=None, nrows=1, engine=choose_engine(source)
+            )
+        return df0.iloc[0, 0]
     except Exception as e:
         raise ValueError(f"Error reading the file: {e}")
-    if isinstance(first_cell, str):
-        if "Виписка з Ваших карток за період" in first_cell:
-            return "privat"
-        if "АТ «Райффайзен Банк»" in first_cell:
-            return "raif"
-    raise ValueError(f"Unknown file structure: {first_cell}")
@@ -0,0 +1,103 @@
+import unittest
+import os
+import shutil
+import time
+from cache import ConversionCache
+
+
+class TestConversionCache(unittest.TestCase):
+    TEST_FILES_DIR = "test_files"
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+        self.cache_dir = os.path.join(self.TEST_FILES_DIR, "cache")
+        self.cache = ConversionCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.TEST_FILES_DIR, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.TEST_FILES_DIR, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_key_depends_on_output_format(self):
+        path = self._write("a.xlsx", "statement")
+        self.assertEqual(self.cache.key(path), self.cache.key(path, "csv"))
+        self.assertNotEqual(self.cache.key(path), self.cache.key(path, "parquet"))
+
+    def test_key_depends_on_sheet(self):
+        path = self._write("a.xlsx", "statement")
+        self.assertNotEqual(self.cache.key(path), self.cache.key(path, "csv", "Card"))
+        self.assertNotEqual(
+            self.cache.key(path, "csv", "Card"), self.cache.key(path, "csv", "Other")
+        )
+
+    def test_key_depends_on_content_only(self):
+        first = self._write("a.xlsx", "statement one")
+        same = self._write("b.xlsx", "statement one")
+        other = self._write("c.xlsx", "statement two")
+        self.assertEqual(self.cache.key(first), self.cache.key(same))
+        self.assertNotEqual(self.cache.key(first), self.cache.key(other))
+
+    def test_store_and_lookup(self):
+        key = self.cache.key(self._write("a.xlsx", "statement"))
+        self.assertIsNone(self.cache.lookup(key))
+
+        output = self._write("a.csv", "Date,Details,Sum\r\n")
+        self.cache.store(key, output)
+        cached = self.cache.lookup(key)
+        self.assertIsNotNone(cached)
+        with open(cached, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Date,Details,Sum\n")
+
+    def test_lookup_drops_expired_entry(self):
+        key = self.cache.key(self._write("a.xlsx", "statement"))
+        self.cache.store(key, self._write("a.csv", "csv"))
+        cached = self.cache.lookup(key)
+        old = time.time() - self.cache.max_age - 10
+        os.utime(cached, (old, old))
+
+        self.assertIsNone(self.cache.lookup(key))
+        self.assertFalse(os.path.exists(cached))
+
+    def test_evict_by_size_removes_least_recently_used(self):
+        cache = ConversionCache(self.cache_dir, max_size=25)
+        paths = []
+        for i in range(3):
+            key = cache.key(self._write(f"{i}.xlsx", f"statement {i}"))
+            cache.store(key, self._write(f"{i}.csv", "x" * 10))
+            path = cache.lookup(key)
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+            paths.append(path)
+
+        cache.evict()
+        self.assertEqual([os.path.exists(path) for path in paths], [False, True, True])
+
+    def test_evict_by_age(self):
+        key = self.cache.key(self._write("a.xlsx", "statement"))
+        self.cache.store(key, self._write("a.csv", "csv"))
+        path = self.cache.lookup(key)
+        old = time.time() - self.cache.max_age - 10
+        os.utime(path, (old, old))
+
+        self.cache.evict()
+        self.assertFalse(os.path.exists(path))
+
+    def test_entries_are_not_named_after_csv(self):
+        key = self.cache.key(self._write("a.xlsx", "statement"), "parquet")
+        self.cache.store(key, self._write("a.parquet", "PAR1"))
+        path = self.cache.lookup(key)
+        self.assertTrue(path.endswith(".out"))
+
+        # Entries of earlier versions, <key>.csv, are evicted
+        legacy = os.path.join(os.path.dirname(path), key + ".csv")
+        shutil.copyfile(path, legacy)
+        self.cache.evict()
+        self.assertFalse(os.path.exists(legacy))
+        self.assertTrue(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
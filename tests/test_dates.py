@@ -0,0 +1,88 @@
+import datetime
+import unittest
+
+import pandas as pd
+
+from columnar import to_datetime_column
+from dates import _date_part, parse_date_time
+
+PRIVAT_FORMAT = "%d.%m.%Y %H:%M:%S"
+RAIF_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+
+def reference(value, dayfirst):
+    # What the processors computed for every row before
+    dt = pd.to_datetime(value, dayfirst=dayfirst)
+    return dt.strftime("%Y/%m/%d"), dt.strftime("%H:%M:%S")
+
+
+class TestParseDateTime(unittest.TestCase):
+    def assert_same_as_pandas(self, values, fmt, dayfirst):
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(
+                    parse_date_time(value, fmt, dayfirst), reference(value, dayfirst)
+                )
+
+    def test_privat_values(self):
+        self.assert_same_as_pandas(
+            [
+                "01.02.2023 10:00:00",
+                "31.12.2024 23:59:59",
+                "1.2.2023 00:00:01",
+                "01.02.2023 9:05:00",
+                "01.02.2023",
+                "2023-02-01 10:00:00",
+                datetime.datetime(2023, 2, 1, 10, 0, 0),
+                pd.Timestamp("2023-02-01 10:00:00"),
+            ],
+            PRIVAT_FORMAT,
+            dayfirst=True,
+        )
+
+    def test_raif_values(self):
+        self.assert_same_as_pandas(
+            [
+                "01/15/2023 10:15:00",
+                "02/01/2023 12:30:00",
+                "12/31/2024 23:59:59",
+                "2023-01-15 10:15:00",
+                "01/15/2023 10:15",
+                datetime.datetime(2023, 1, 15, 10, 15),
+            ],
+            RAIF_FORMAT,
+            dayfirst=False,
+        )
+
+    def test_invalid_value_raises_like_pandas(self):
+        with self.assertRaises(ValueError):
+            parse_date_time("not a date", PRIVAT_FORMAT, dayfirst=True)
+
+    def test_date_part_is_cached(self):
+        _date_part.cache_clear()
+        for second in range(10):
+            parse_date_time(f"05.06.2023 10:00:{second:02d}", PRIVAT_FORMAT, True)
+        info = _date_part.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 9))
+
+
+class TestToDatetimeColumn(unittest.TestCase):
+    def test_explicit_format_matches_inferred_parsing(self):
+        values = pd.Series(["01.02.2023 10:00:00", "13.02.2023 11:30:15"])
+        self.assertTrue(
+            to_datetime_column(values, True, PRIVAT_FORMAT).equals(
+                to_datetime_column(values, True)
+            )
+        )
+
+    def test_format_mismatch_falls_back(self):
+        values = pd.Series(["01.02.2023 10:00:00", "2023-02-13 11:30:15"])
+        parsed = to_datetime_column(values, True, PRIVAT_FORMAT)
+        self.assertEqual(
+            parsed.dt.strftime("%Y/%m/%d %H:%M:%S").tolist(),
+            ["2023/02/01 10:00:00", "2023/02/13 11:30:15"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
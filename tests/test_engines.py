@@ -0,0 +1,143 @@
+import datetime
+import os
+import unittest
+from unittest import mock
+
+from engines import choose_engine, is_available
+from main import convert_file
+from tests.test_utils import create_excel_file
+
+try:
+    import xlwt
+except ImportError:  # xlwt is only needed to build .xls fixtures
+    xlwt = None
+
+PRIVAT_DATA = [
+    ["Виписка з Ваших карток за період 01.01.2023 - 31.01.2023"],
+    [
+        "Дата",
+        "Категорія",
+        "Картка",
+        "Опис операції",
+        "Сума в валюті картки",
+        "Валюта картки",
+        "Сума в валюті транзакції",
+        "Валюта транзакції",
+        "Залишок на кінець періоду",
+    ],
+    ["01.01.2023 10:00:00", "Cat A", "5168", "Op 1", -100.0, "UAH", -100.0, "UAH", 1],
+    ["02.01.2023 12:00:00", None, "5168", "Op 2", -412.35, "UAH", -10.0, "USD", 2.5],
+    [None, None, None, None, None, None, None, None, None],
+    ["03.01.2023 08:30:15", " ", "5168", 12345, 1500.5, "UAH", 1500.5, "UAH", None],
+]
+
+RAIF_DATA = [
+    ["АТ «Райффайзен Банк»"],
+    ["Виписка по рахунку"],
+    [None],
+    [
+        "Дата і час здійснення операції",
+        "Дата обробки операції",
+        "Деталі операції",
+        "Сума у валюті операції",
+        "Валюта",
+        "Сума у валюті рахунку",
+        "Сума кешбеку",
+    ],
+    ["01/15/2023 10:15:00", "01/15/2023", "Покупка: Shop", 150.0, "UAH", 150.0, 0],
+    ["02/20/2023 12:30:00", None, "Повернення: Return", 200.0, "EUR", 75.0, 1.5],
+    ["02/21/2023 09:00:00", "02/21/2023", "Plain text", 10.0, None, 10.0, None],
+]
+
+
+class TestChooseEngine(unittest.TestCase):
+    def _available(self, *engines):
+        return mock.patch("engines.is_available", side_effect=engines.__contains__)
+
+    def test_prefers_calamine_when_installed(self):
+        with self._available("calamine", "openpyxl", "xlrd"):
+            self.assertEqual(choose_engine("a.xlsx"), "calamine")
+            self.assertEqual(choose_engine("a.XLS"), "calamine")
+            # Streaming keeps to the readers that do not load the whole sheet
+            self.assertEqual(choose_engine("a.xlsx", streaming=True), "openpyxl")
+            self.assertEqual(choose_engine("a.xls", streaming=True), "xlrd")
+
+    def test_falls_back_by_file_type(self):
+        with self._available("openpyxl", "xlrd"):
+            self.assertEqual(choose_engine("a.xlsx"), "openpyxl")
+            self.assertEqual(choose_engine("a.xls"), "xlrd")
+            self.assertIsNone(choose_engine("a.ods"))
+
+    def test_given_engine_is_checked(self):
+        with self._available("openpyxl", "xlrd"):
+            self.assertEqual(choose_engine("a.xlsx", "openpyxl"), "openpyxl")
+            with self.assertRaisesRegex(ValueError, "cannot read .xlsx"):
+                choose_engine("a.xlsx", "xlrd")
+            with self.assertRaisesRegex(ValueError, "pip install python-calamine"):
+                choose_engine("a.xlsx", "calamine", streaming=True)
+
+
+class TestEngineParity(unittest.TestCase):
+    TEST_FILES_DIR = "test_files"
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+
+    def tearDown(self):
+        for filename in os.listdir(self.TEST_FILES_DIR):
+            os.remove(os.path.join(self.TEST_FILES_DIR, filename))
+        if not os.listdir(self.TEST_FILES_DIR):
+            os.rmdir(self.TEST_FILES_DIR)
+
+    def _create_xls_file(self, filepath, data):
+        book = xlwt.Workbook(encoding="utf-8")
+        sheet = book.add_sheet("Sheet1")
+        for r, row in enumerate(data):
+            for c, value in enumerate(row):
+                if value is not None:
+                    sheet.write(r, c, value)
+        book.save(filepath)
+
+    def _outputs(self, filepath, engines):
+        """
+        Converts filepath with every engine, loading the whole sheet and
+        streaming, and returns {(engine, stream): CSV bytes}.
+        """
+        outputs = {}
+        for engine in engines:
+            for stream in (False, True):
+                output_file = convert_file(filepath, stream=stream, engine=engine)
+                with open(output_file, "rb") as f:
+                    outputs[engine, stream] = f.read()
+                os.remove(output_file)
+        return outputs
+
+    def _assert_identical(self, filepath, engines):
+        outputs = self._outputs(filepath, engines)
+        reference = outputs[engines[0], False]
+        self.assertGreater(reference.count(b"\n"), 1)
+        for (engine, stream), output in outputs.items():
+            with self.subTest(engine=engine, stream=stream):
+                self.assertEqual(output, reference)
+
+    @unittest.skipUnless(is_available("calamine"), "python-calamine is not installed")
+    def test_xlsx_engines_produce_identical_csv(self):
+        privat = [row[:] for row in PRIVAT_DATA]
+        # A real date cell next to the text dates
+        privat[3][0] = datetime.datetime(2023, 1, 2, 12, 0, 0)
+        for name, data in (("privat", privat), ("raif", RAIF_DATA)):
+            filepath = os.path.join(self.TEST_FILES_DIR, f"parity_{name}.xlsx")
+            create_excel_file(filepath, "Sheet1", data)
+            self._assert_identical(filepath, ["openpyxl", "calamine"])
+
+    @unittest.skipUnless(is_available("calamine"), "python-calamine is not installed")
+    @unittest.skipIf(xlwt is None, "xlwt is not installed")
+    def test_xls_engines_produce_identical_csv(self):
+        for name, data in (("privat", PRIVAT_DATA), ("raif", RAIF_DATA)):
+            filepath = os.path.join(self.TEST_FILES_DIR, f"parity_{name}.xls")
+            self._create_xls_file(filepath, data)
+            self._assert_identical(filepath, ["xlrd", "calamine"])
+
+
+if __name__ == "__main__":
+    unittest.main()
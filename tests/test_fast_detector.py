@@ -0,0 +1,145 @@
+import unittest
+import os
+from unittest import mock
+import pandas as pd
+from fast_detector import read_first_cell, read_sheet_names
+from structure_detector import detect_structure
+from tests.test_utils import create_excel_file, create_excel_workbook
+
+try:
+    import xlwt
+except ImportError:  # xlwt is only needed to build .xls fixtures
+    xlwt = None
+
+
+class TestFastDetector(unittest.TestCase):
+    TEST_FILES_DIR = "test_files"
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+
+    def tearDown(self):
+        for filename in os.listdir(self.TEST_FILES_DIR):
+            os.remove(os.path.join(self.TEST_FILES_DIR, filename))
+        if not os.listdir(self.TEST_FILES_DIR):
+            os.rmdir(self.TEST_FILES_DIR)
+
+    def _create_xls_file(self, filepath, data):
+        book = xlwt.Workbook(encoding="utf-8")
+        sheet = book.add_sheet("Sheet1")
+        for r, row in enumerate(data):
+            for c, value in enumerate(row):
+                if value is not None:
+                    sheet.write(r, c, value)
+        book.save(filepath)
+
+    def test_xlsx_first_cell_from_shared_strings(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_raif.xlsx")
+        data = [
+            ["Other text", "АТ «Райффайзен Банк»"],
+            ["АТ «Райффайзен Банк»"],
+        ]
+        create_excel_file(filepath, "Sheet1", data)
+        self.assertEqual(read_first_cell(filepath), "Other text")
+
+        data = [["Виписка з Ваших карток за період 01.01.2023"], ["x"]]
+        create_excel_file(filepath, "Sheet1", data)
+        self.assertEqual(
+            read_first_cell(filepath), "Виписка з Ваших карток за період 01.01.2023"
+        )
+
+    def test_xlsx_unsure_cases_return_none(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_numeric.xlsx")
+        create_excel_file(filepath, "Sheet1", [[42, "АТ «Райффайзен Банк»"]])
+        self.assertIsNone(read_first_cell(filepath))
+
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_empty_a1.xlsx")
+        create_excel_file(filepath, "Sheet1", [[None, "text"]])
+        self.assertIsNone(read_first_cell(filepath))
+
+        filepath = os.path.join(self.TEST_FILES_DIR, "not_excel.xlsx")
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write("plain text")
+        self.assertIsNone(read_first_cell(filepath))
+
+    @unittest.skipIf(xlwt is None, "xlwt is not installed")
+    def test_xls_first_cell(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_privat.xls")
+        self._create_xls_file(
+            filepath,
+            [["Виписка з Ваших карток за період"], ["АТ «Райффайзен Банк»", 1.5]],
+        )
+        self.assertEqual(read_first_cell(filepath), "Виписка з Ваших карток за період")
+        self.assertEqual(detect_structure(filepath), "privat")
+
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_empty_a1.xls")
+        self._create_xls_file(filepath, [[None, "АТ «Райффайзен Банк»"]])
+        self.assertIsNone(read_first_cell(filepath))
+
+    @unittest.skipIf(xlwt is None, "xlwt is not installed")
+    def test_xls_shared_string_across_continue_records(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_long_sst.xls")
+        book = xlwt.Workbook(encoding="utf-8")
+        sheet = book.add_sheet("Sheet1")
+        other = book.add_sheet("Other")
+        # Strings are shared in the order they are written, so A1 is a late
+        # entry of an SST long enough to be split into CONTINUE records
+        for row in range(300):
+            other.write(row, 0, f"Операція {row} " + "ї" * 100)
+            other.write(row, 1, f"Op {row} " + "x" * 100)
+        a1 = "Виписка з Ваших карток за період " + "ґ" * 3000
+        sheet.write(0, 0, a1)
+        book.save(filepath)
+        # The file is read without xlrd
+        with mock.patch.dict("sys.modules", {"xlrd": None}):
+            self.assertEqual(read_first_cell(filepath), a1)
+            self.assertEqual(
+                read_first_cell(filepath, "Other"), "Операція 0 " + "ї" * 100
+            )
+            self.assertEqual(read_sheet_names(filepath), ["Sheet1", "Other"])
+
+    def test_xlsx_sheet_names_and_first_cell_by_sheet(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_sheets.xlsx")
+        create_excel_workbook(
+            filepath,
+            {"Summary": [["Totals"]], "Card 1": [["АТ «Райффайзен Банк»"]]},
+        )
+        self.assertEqual(read_sheet_names(filepath), ["Summary", "Card 1"])
+        self.assertEqual(read_first_cell(filepath), "Totals")
+        self.assertEqual(read_first_cell(filepath, "Card 1"), "АТ «Райффайзен Банк»")
+        self.assertIsNone(read_first_cell(filepath, "Missing"))
+
+    @unittest.skipIf(xlwt is None, "xlwt is not installed")
+    def test_xls_sheet_names_and_first_cell_by_sheet(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_sheets.xls")
+        book = xlwt.Workbook(encoding="utf-8")
+        book.add_sheet("Summary").write(0, 0, "Totals")
+        book.add_sheet("Card 1").write(0, 0, "Виписка з Ваших карток за період")
+        book.save(filepath)
+        self.assertEqual(read_sheet_names(filepath), ["Summary", "Card 1"])
+        self.assertEqual(
+            read_first_cell(filepath, "Card 1"), "Виписка з Ваших карток за період"
+        )
+
+    def test_detect_structure_skips_pandas_when_sure(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_detect.xlsx")
+        create_excel_file(filepath, "Sheet1", [["АТ «Райффайзен Банк»"], ["x"]])
+        with mock.patch(
+            "structure_detector.pd.read_excel", wraps=pd.read_excel
+        ) as read_excel:
+            self.assertEqual(detect_structure(filepath), "raif")
+        self.assertEqual(read_excel.call_count, 0)
+
+    def test_detect_structure_falls_back_to_pandas(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "fast_fallback.xlsx")
+        create_excel_file(filepath, "Sheet1", [[12345], ["x"]])
+        with mock.patch(
+            "structure_detector.pd.read_excel", wraps=pd.read_excel
+        ) as read_excel:
+            with self.assertRaises(ValueError):
+                detect_structure(filepath)
+        self.assertEqual(read_excel.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from fx_rates import FX_FIELDNAMES, FxRateTable, fx_rates_file
+from transaction import Transaction
+
+
+def _converted(date, amount, original_amount, currency, fx_rate):
+    return Transaction(
+        date,
+        "12:00:00",
+        "Shop",
+        amount=amount,
+        original_amount=original_amount,
+        original_currency=currency,
+        fx_rate=fx_rate,
+    )
+
+
+class TestFxRateTable(unittest.TestCase):
+    def test_rates_by_day_and_currency(self):
+        records = [
+            _converted("2023/01/02", -4125, -100, "USD", 4125),
+            Transaction("2023/01/02", "13:00:00", "Coffee", amount=-5000),
+            _converted("2023/01/01", -4400, -100, "EUR", 4400),
+            _converted("2023/01/02", 8300, 200, "USD", 4150),
+            _converted("2023/01/02", -4100, -100, "USD", 4100),
+        ]
+        table = FxRateTable()
+        # Records pass through unchanged
+        self.assertEqual(list(table.collect(records)), records)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(
+            table.rows(),
+            [
+                ("2023/01/01", "EUR", 1, "1.00", "44.00", "44.00", "44.00", "44.00"),
+                # Turnover is summed in absolute amounts: 165.25 / 4.00
+                ("2023/01/02", "USD", 3, "4.00", "165.25", "41.31", "41.00", "41.50"),
+            ],
+        )
+
+    def test_write(self):
+        table = FxRateTable()
+        table.add(_converted("2023/01/01", -4400, -100, "EUR", 4400))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = fx_rates_file(os.path.join(tmp, "statement.csv"))
+            self.assertEqual(os.path.basename(path), "statement.fx-rates.csv")
+            self.assertEqual(table.write(path), 1)
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(rows[0], list(FX_FIELDNAMES))
+        self.assertEqual(
+            rows[1],
+            ["2023/01/01", "EUR", "1", "1.00", "44.00", "44.00", "44.00", "44.00"],
+        )
+
+    def test_empty_table_has_header_only(self):
+        table = FxRateTable()
+        table.add(Transaction("2023/01/02", "13:00:00", "Coffee", amount=-5000))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rates.csv")
+            self.assertEqual(table.write(path), 0)
+            with open(path, newline="", encoding="utf-8") as f:
+                self.assertEqual(list(csv.reader(f)), [list(FX_FIELDNAMES)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import csv
+import os
+import shutil
+import unittest
+
+from ledger_index import LedgerIndex, transaction_key
+from output import write_csv
+
+
+class TestLedgerIndex(unittest.TestCase):
+    TEST_FILES_DIR = "test_files_ledger"
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+        self.ledger_path = os.path.join(self.TEST_FILES_DIR, "ledger.csv")
+        self.records = [
+            {"Date": "2023/01/01", "Details": "Coffee <Cafe> 10:00:00", "Sum": "-3.50"},
+            {
+                "Date": "2023/01/02",
+                "Details": "Taxi <Transport> 11:00:00",
+                "Sum": "-8.00",
+            },
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.TEST_FILES_DIR, ignore_errors=True)
+
+    def _append(self, index, records):
+        written = write_csv(index.filter_new(records), self.ledger_path, append=True)
+        index.save()
+        return written
+
+    def _ledger_rows(self):
+        with open(self.ledger_path, newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def test_transaction_key_normalizes_details(self):
+        record = dict(self.records[0])
+        spaced = dict(record, Details="  coffee   <CAFE> 10:00:00 ")
+        self.assertEqual(transaction_key(record), transaction_key(spaced))
+        self.assertNotEqual(
+            transaction_key(record), transaction_key(dict(record, Sum="-3.60"))
+        )
+        self.assertNotEqual(transaction_key(record), transaction_key(record, 1))
+
+    def test_filter_new_skips_known_records(self):
+        index = LedgerIndex.load(self.ledger_path)
+        self.assertEqual(self._append(index, self.records), 2)
+
+        new = {
+            "Date": "2023/01/03",
+            "Details": "Rent <Home> 09:00:00",
+            "Sum": "-500.00",
+        }
+        self.assertEqual(self._append(index, self.records + [new]), 1)
+        self.assertEqual(len(index), 3)
+
+        rows = self._ledger_rows()
+        self.assertEqual(rows[0], ["Date", "Details", "Sum"])
+        self.assertEqual(
+            [row[0] for row in rows[1:]], ["2023/01/01", "2023/01/02", "2023/01/03"]
+        )
+
+    def test_identical_transactions_within_a_statement_are_kept(self):
+        index = LedgerIndex.load(self.ledger_path)
+        twice = [self.records[0], dict(self.records[0])]
+        self.assertEqual(self._append(index, twice), 2)
+        # Re-importing the same statement adds nothing, a third one is new
+        self.assertEqual(self._append(index, twice), 0)
+        self.assertEqual(self._append(index, twice + [dict(self.records[0])]), 1)
+
+    def test_index_is_persisted_and_reloaded(self):
+        self._append(LedgerIndex.load(self.ledger_path), self.records)
+        self.assertTrue(os.path.exists(self.ledger_path + ".idx"))
+
+        reloaded = LedgerIndex.load(self.ledger_path)
+        self.assertEqual(len(reloaded), 2)
+        self.assertEqual(list(reloaded.filter_new(self.records)), [])
+
+    def test_index_is_rebuilt_from_ledger(self):
+        self._append(LedgerIndex.load(self.ledger_path), self.records)
+        os.remove(self.ledger_path + ".idx")
+        self.assertEqual(
+            list(LedgerIndex.load(self.ledger_path).filter_new(self.records)), []
+        )
+
+    def test_stale_index_is_rebuilt(self):
+        index = LedgerIndex.load(self.ledger_path)
+        self._append(index, self.records[:1])
+        # The ledger was extended without updating the index
+        write_csv(self.records[1:], self.ledger_path, append=True)
+        reloaded = LedgerIndex.load(self.ledger_path)
+        self.assertEqual(len(reloaded), 2)
+        self.assertEqual(list(reloaded.filter_new(self.records)), [])
+
+    def test_discard_forgets_unsaved_records(self):
+        index = LedgerIndex.load(self.ledger_path)
+        self.assertEqual(len(list(index.filter_new(self.records))), 2)
+        index.discard()
+        self.assertEqual(len(list(index.filter_new(self.records))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,15 @@ import unittest
 import os
 import subprocess
 import csv
+import json
+import pstats
+import shutil
+import signal
+import tempfile
+import time
 import inspect  # Added import
-from tests.test_utils import create_excel_file
+from unittest import mock
+from tests.test_utils import create_excel_file, create_excel_workbook
 
 
 class TestMainIntegration(unittest.TestCase):
@@ -14,6 +21,17 @@ class TestMainIntegration(unittest.TestCase):
             os.path.join(os.path.dirname(__file__), "..")
         )
 
+        # main.py caches conversions by default; keep the runs below out of
+        # the user's cache, and from passing on a cache hit left by another
+        # test, with a fresh cache directory inherited by every subprocess
+        cache_dir = tempfile.TemporaryDirectory(prefix="test_main-cache-")
+        self.addCleanup(cache_dir.cleanup)
+        env = mock.patch.dict(
+            os.environ, {"BANK_STATEMENT_SYNC_CACHE_DIR": cache_dir.name}
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
         # Directory where test files are created by test_main.py (e.g., tests/test_files)
         self.creation_dir = os.path.join(os.path.dirname(__file__), "test_files")
         os.makedirs(self.creation_dir, exist_ok=True)
@@ -196,6 +214,487 @@ class TestMainIntegration(unittest.TestCase):
             with self.assertRaises(StopIteration):  # Ensure no more rows
                 next(reader)
 
+    def test_main_stream_mode(self):
+        self._create_raif_test_file(self.raif_input_creation_path)
+        expected_csv_path = os.path.join(
+            self.project_root, self.main_py_arg_dir, "raif_input.csv"
+        )
+
+        result = subprocess.run(
+            ["python", self.MAIN_SCRIPT_PATH, "--stream", self.raif_input_arg],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(
+            result.returncode,
+            0,
+            msg=f"main.py exited with {result.returncode}.\nstdout:\n{result.stdout}\nstderr:\n{result.stderr}",
+        )
+
+        expected_csv_data = [
+            ["Date", "Details", "Sum"],
+            ["2023/01/15", "Detail <Raif Op 1> 10:15:00", "-150.00"],
+            [
+                "2023/02/20",
+                "Return <Повернення> 12:30:00 (200.00 EUR @ 0.38) [cashback 1.50]",
+                "75.00",
+            ],
+        ]
+        with open(expected_csv_path, mode="r", newline="", encoding="utf-8") as csvfile:
+            self.assertEqual(list(csv.reader(csvfile)), expected_csv_data)
+
+    def test_main_batch_partial_failure(self):
+        self._create_privat_test_file(self.privat_input_creation_path)
+        self._create_raif_test_file(self.raif_input_creation_path)
+        create_excel_file(
+            self.unknown_input_creation_path, "Sheet1", [["Unknown Header Line"]]
+        )
+
+        result = subprocess.run(
+            [
+                "python",
+                self.MAIN_SCRIPT_PATH,
+                "--workers",
+                "2",
+                self.privat_input_arg,
+                self.raif_input_arg,
+                self.unknown_input_arg,
+            ],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(result.returncode, 2, msg=result.stderr)
+        self.assertIn("Converted 2 of 3 files, 1 failed", result.stdout)
+        self.assertIn(f"OK      {self.privat_input_arg}", result.stdout)
+        self.assertIn(f"OK      {self.raif_input_arg}", result.stdout)
+        self.assertIn(f"FAILED  {self.unknown_input_arg}", result.stderr)
+        self.assertIn("Error detecting structure", result.stderr)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.creation_dir, "privat_input.csv"))
+        )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.creation_dir, "raif_input.csv"))
+        )
+
+    def test_main_batch_directory_and_glob(self):
+        self._create_privat_test_file(self.privat_input_creation_path)
+        self._create_raif_test_file(self.raif_input_creation_path)
+        # Excel lock files and hidden files are not statements
+        for name in ("~$raif_input.xlsx", ".privat_input.xlsx"):
+            with open(os.path.join(self.creation_dir, name), "wb") as f:
+                f.write(b"owner")
+
+        result = subprocess.run(
+            [
+                "python",
+                self.MAIN_SCRIPT_PATH,
+                self.main_py_arg_dir,
+                os.path.join(self.main_py_arg_dir, "*.xlsx"),
+            ],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        # Directory and glob resolve to the same two files, converted once each
+        self.assertIn("Converted 2 of 2 files, 0 failed", result.stdout)
+
+    def test_main_reuses_cached_conversion(self):
+        self._create_privat_test_file(self.privat_input_creation_path)
+        cache_dir = os.path.join(self.creation_dir, "cache")
+        csv_path = os.path.join(self.creation_dir, "privat_input.csv")
+        command = [
+            "python",
+            self.MAIN_SCRIPT_PATH,
+            "--cache-dir",
+            os.path.join(self.main_py_arg_dir, "cache"),
+            self.privat_input_arg,
+        ]
+        try:
+            first = subprocess.run(
+                command, capture_output=True, text=True, cwd=self.project_root
+            )
+            self.assertEqual(first.returncode, 0, msg=first.stderr)
+            self.assertNotIn("Cache hit", first.stdout)
+            with open(csv_path, encoding="utf-8") as f:
+                expected = f.read()
+
+            # A removed output is restored from the cache without converting
+            os.remove(csv_path)
+            second = subprocess.run(
+                command, capture_output=True, text=True, cwd=self.project_root
+            )
+            self.assertEqual(second.returncode, 0, msg=second.stderr)
+            self.assertIn("Cache hit", second.stdout)
+            with open(csv_path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), expected)
+
+            third = subprocess.run(
+                command[:1] + [self.MAIN_SCRIPT_PATH, "--no-cache"] + command[2:],
+                capture_output=True,
+                text=True,
+                cwd=self.project_root,
+            )
+            self.assertEqual(third.returncode, 0, msg=third.stderr)
+            self.assertNotIn("Cache hit", third.stdout)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def test_main_incremental_appends_only_new_transactions(self):
+        self._create_raif_test_file(self.raif_input_creation_path)
+        ledger_path = os.path.join(self.creation_dir, "ledger.csv")
+        command = [
+            "python",
+            self.MAIN_SCRIPT_PATH,
+            "--incremental",
+            os.path.join(self.main_py_arg_dir, "ledger.csv"),
+            self.raif_input_arg,
+        ]
+        try:
+            first = subprocess.run(
+                command, capture_output=True, text=True, cwd=self.project_root
+            )
+            self.assertEqual(first.returncode, 0, msg=first.stderr)
+            self.assertIn("Appended 2 new transactions", first.stdout)
+
+            # An overlapping statement adds only the transaction not seen yet
+            create_excel_file(
+                self.raif_input_creation_path,
+                "Sheet1",
+                [
+                    ["АТ «Райффайзен Банк»"],
+                    [
+                        "Дата і час здійснення операції",
+                        "Деталі операції",
+                        "Сума у валюті операції",
+                        "Валюта",
+                        "Сума у валюті рахунку",
+                        "Сума кешбеку",
+                    ],
+                    ["01/15/2023 10:15:00", "Raif Op 1: Detail", 150.00, "", 150.00, 0],
+                    ["03/01/2023 09:00:00", "Raif Op 3: New", 20.00, "", 20.00, 0],
+                ],
+            )
+            second = subprocess.run(
+                command, capture_output=True, text=True, cwd=self.project_root
+            )
+            self.assertEqual(second.returncode, 0, msg=second.stderr)
+            self.assertIn("Appended 1 new transactions", second.stdout)
+
+            with open(ledger_path, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ["Date", "Details", "Sum"])
+            self.assertEqual(
+                [row[0] for row in rows[1:]],
+                ["2023/01/15", "2023/02/20", "2023/03/01"],
+            )
+            self.assertFalse(
+                os.path.exists(os.path.join(self.creation_dir, "raif_input.csv"))
+            )
+        finally:
+            if os.path.exists(ledger_path + ".idx"):
+                os.remove(ledger_path + ".idx")
+
+    def test_main_merge_command(self):
+        self._create_privat_test_file(self.privat_input_creation_path)
+        self._create_raif_test_file(self.raif_input_creation_path)
+        result = subprocess.run(
+            [
+                "python",
+                self.MAIN_SCRIPT_PATH,
+                "merge",
+                "-o",
+                os.path.join(self.main_py_arg_dir, "merged.csv"),
+                self.raif_input_arg,
+                self.privat_input_arg,
+            ],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("Merged 4 transactions from 2 files", result.stdout)
+
+        with open(
+            os.path.join(self.creation_dir, "merged.csv"), newline="", encoding="utf-8"
+        ) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["Date", "Details", "Sum", "Account"])
+        self.assertEqual(
+            [(row[0], row[3]) for row in rows[1:]],
+            [
+                ("2023/01/01", "privat_input"),
+                ("2023/01/02", "privat_input"),
+                ("2023/01/15", "raif_input"),
+                ("2023/02/20", "raif_input"),
+            ],
+        )
+
+        result = subprocess.run(
+            [
+                "python",
+                self.MAIN_SCRIPT_PATH,
+                "merge",
+                "-o",
+                os.path.join(self.main_py_arg_dir, "missing_dir", "merged.csv"),
+                self.raif_input_arg,
+            ],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Error writing", result.stderr)
+        self.assertNotIn("Traceback", result.stderr)
+
+    def test_main_sheets_merge_and_split(self):
+        privat = [
+            ["Виписка з Ваших карток за період..."],
+            ["Дата", "Опис операції", "Валюта картки", "Сума в валюті картки"]
+            + ["Валюта транзакції", "Сума в валюті транзакції"],
+            ["01.01.2023 10:00:00", "Card Op", "UAH", -100.0, "UAH", -100.0],
+        ]
+        raif = [
+            ["АТ «Райффайзен Банк»"],
+            ["Дата і час здійснення операції", "Деталі операції"]
+            + ["Сума у валюті рахунку"],
+            ["01/15/2023 10:15:00", "Покупка: Account Op", 150.0],
+            ["01/16/2023 11:00:00", "Поповнення: Salary", 1000.0],
+        ]
+        create_excel_workbook(
+            os.path.join(self.creation_dir, "multi_input.xlsx"),
+            {"Summary": [["Totals"]], "Card": privat, "Account": raif},
+        )
+        command = [
+            "python",
+            self.MAIN_SCRIPT_PATH,
+            os.path.join(self.main_py_arg_dir, "multi_input.xlsx"),
+            "--no-cache",
+            "--sheets",
+        ]
+
+        result = subprocess.run(
+            command + ["merge"], capture_output=True, text=True, cwd=self.project_root
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        with open(os.path.join(self.creation_dir, "multi_input.csv"), "rb") as f:
+            merged = f.read()
+        self.assertEqual(
+            merged.decode("utf-8").splitlines(),
+            [
+                "Date,Details,Sum",
+                "2023/01/01,Card Op 10:00:00,-100.00",
+                "2023/01/15,Account Op <Покупка> 10:15:00,-150.00",
+                "2023/01/16,Salary <Поповнення> 11:00:00,1000.00",
+            ],
+        )
+
+        result = subprocess.run(
+            command + ["split"], capture_output=True, text=True, cwd=self.project_root
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertIn("Converted 2 of 2 files", result.stdout)
+        parts = []
+        for sheet in ("Card", "Account"):
+            with open(
+                os.path.join(self.creation_dir, f"multi_input.{sheet}.csv"), "rb"
+            ) as f:
+                parts.append(f.read())
+        self.assertEqual(parts[0] + parts[1].split(b"\n", 1)[1], merged)
+
+    def test_main_watch_converts_new_statements(self):
+        watch_dir = os.path.join(self.creation_dir, "watched")
+        os.makedirs(watch_dir, exist_ok=True)
+        daemon = subprocess.Popen(
+            [
+                "python",
+                self.MAIN_SCRIPT_PATH,
+                "watch",
+                os.path.join(self.main_py_arg_dir, "watched"),
+                "--no-cache",
+                "--workers",
+                "1",
+                "--interval",
+                "0.1",
+                "--settle",
+                "0.3",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=self.project_root,
+        )
+        try:
+            self._create_privat_test_file(os.path.join(watch_dir, "privat.xlsx"))
+            csv_path = os.path.join(watch_dir, "privat.csv")
+            deadline = time.monotonic() + 60
+            while not os.path.exists(csv_path) and time.monotonic() < deadline:
+                time.sleep(0.1)
+            daemon.send_signal(signal.SIGTERM)
+            stdout, stderr = daemon.communicate(timeout=30)
+            self.assertEqual(daemon.returncode, 0, msg=stderr)
+            self.assertIn("OK ", stdout)
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ["Date", "Details", "Sum"])
+            self.assertEqual(len(rows), 3)
+        finally:
+            if daemon.poll() is None:
+                daemon.kill()
+                daemon.communicate()
+            shutil.rmtree(watch_dir, ignore_errors=True)
+
+    def test_main_import_does_not_load_pandas(self):
+        # --help and argument errors must not pay for importing pandas or numpy
+        result = subprocess.run(
+            [
+                "python",
+                "-c",
+                "import sys, main; print('pandas' in sys.modules, "
+                "'numpy' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertEqual(result.stdout.strip(), "False False")
+
+    def test_main_timings_and_profile(self):
+        self._create_raif_test_file(self.raif_input_creation_path)
+        report_path = os.path.join(self.creation_dir, "timings.json")
+        profile_path = os.path.join(self.creation_dir, "profile.out")
+        try:
+            result = subprocess.run(
+                [
+                    "python",
+                    self.MAIN_SCRIPT_PATH,
+                    "--no-cache",
+                    "--timings",
+                    os.path.join(self.main_py_arg_dir, "timings.json"),
+                    "--profile",
+                    os.path.join(self.main_py_arg_dir, "profile.out"),
+                    self.raif_input_arg,
+                ],
+                capture_output=True,
+                text=True,
+                cwd=self.project_root,
+            )
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+            with open(report_path, encoding="utf-8") as f:
+                report = json.load(f)
+            self.assertEqual(len(report["files"]), 1)
+            entry = report["files"][0]
+            self.assertEqual(entry["input"], self.raif_input_arg)
+            self.assertIsNone(entry["error"])
+            stages = entry["stages"]
+            self.assertEqual(
+                set(stages), {"detect", "read_excel", "process", "write_csv"}
+            )
+            self.assertEqual(stages["process"]["rows"], 2)
+            self.assertEqual(stages["write_csv"]["rows"], 2)
+            self.assertEqual(stages["read_excel"]["calls"], 1)
+
+            self.assertGreater(pstats.Stats(profile_path).total_calls, 0)
+        finally:
+            for path in (report_path, profile_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_main_timings_report_on_stdout_is_json(self):
+        self._create_raif_test_file(self.raif_input_creation_path)
+        self._create_privat_test_file(self.privat_input_creation_path)
+        command = [
+            "python",
+            self.MAIN_SCRIPT_PATH,
+            "--timings",
+            "-",
+            self.raif_input_arg,
+            self.privat_input_arg,
+        ]
+        # The second run logs cache hits; neither they nor the per-file
+        # summary may end up in the report
+        for run in range(2):
+            result = subprocess.run(
+                command, capture_output=True, text=True, cwd=self.project_root
+            )
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            report = json.loads(result.stdout)
+            self.assertEqual(len(report["files"]), 2)
+            self.assertIn("Converted 2 of 2 files", result.stderr)
+        self.assertIn("Cache hit", result.stderr)
+
+        result = subprocess.run(
+            command[:4] + [self.raif_input_arg],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(json.loads(result.stdout)["files"][0]["error"], None)
+        self.assertIn("Successfully wrote output", result.stderr)
+
+    def test_main_engine_option(self):
+        self._create_privat_test_file(self.privat_input_creation_path)
+        command = ["python", self.MAIN_SCRIPT_PATH, self.privat_input_arg, "--no-cache"]
+
+        result = subprocess.run(
+            command + ["--engine", "openpyxl"],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.creation_dir, "privat_input.csv"))
+        )
+
+        result = subprocess.run(
+            command + ["--engine", "xlrd"],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("Engine 'xlrd' cannot read .xlsx files", result.stderr)
+
+    def test_main_fx_rates_option(self):
+        self._create_raif_test_file(self.raif_input_creation_path)
+        command = ["python", self.MAIN_SCRIPT_PATH, self.raif_input_arg, "--no-cache"]
+
+        result = subprocess.run(
+            command + ["--fx-rates"],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        with open(
+            os.path.join(self.creation_dir, "raif_input.fx-rates.csv"),
+            newline="",
+            encoding="utf-8",
+        ) as f:
+            self.assertEqual(
+                list(csv.reader(f)),
+                [
+                    ["Date", "Currency", "Transactions", "Original", "Converted"]
+                    + ["Rate", "Min Rate", "Max Rate"],
+                    ["2023/02/20", "EUR", "1", "200.00", "75.00"]
+                    + ["0.38", "0.38", "0.38"],
+                ],
+            )
+
+        result = subprocess.run(
+            command + ["--fx-rates", "--incremental", "ledger.csv"],
+            capture_output=True,
+            text=True,
+            cwd=self.project_root,
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("--fx-rates cannot be combined with --incremental", result.stderr)
+
     def test_main_input_file_not_found(self):
         non_existent_file_arg = os.path.join(
             self.main_py_arg_dir, "non_existent_file.xlsx"
@@ -0,0 +1,140 @@
+import csv
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import merge
+from merge import account_name, merge_statements
+from tests.test_utils import create_excel_file
+
+
+class TestMerge(unittest.TestCase):
+    TEST_FILES_DIR = "test_files_merge"
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+        self.privat_path = os.path.join(self.TEST_FILES_DIR, "privat_card.xlsx")
+        self.raif_path = os.path.join(self.TEST_FILES_DIR, "raif_card.xlsx")
+        self.output_path = os.path.join(self.TEST_FILES_DIR, "ledger.csv")
+        create_excel_file(
+            self.privat_path,
+            "Sheet1",
+            [
+                ["Виписка з Ваших карток за період"],
+                [
+                    "Дата",
+                    "Категорія",
+                    "Опис операції",
+                    "Сума в валюті картки",
+                    "Валюта картки",
+                    "Сума в валюті транзакції",
+                    "Валюта транзакції",
+                ],
+                # Statements list the newest operations first
+                ["03.01.2023 09:00:00", "Cat", "Privat 3", -30.0, "UAH", -30.0, "UAH"],
+                ["01.01.2023 12:00:00", "Cat", "Privat 1", -10.0, "UAH", -10.0, "UAH"],
+                ["01.01.2023 08:00:00", "Cat", "Privat 0", -5.0, "UAH", -5.0, "UAH"],
+            ],
+        )
+        create_excel_file(
+            self.raif_path,
+            "Sheet1",
+            [
+                ["АТ «Райффайзен Банк»"],
+                [
+                    "Дата і час здійснення операції",
+                    "Деталі операції",
+                    "Сума у валюті операції",
+                    "Валюта",
+                    "Сума у валюті рахунку",
+                    "Сума кешбеку",
+                ],
+                ["01/02/2023 10:00:00", "Покупка: Raif 2", 20.0, "", 20.0, 0],
+                ["01/01/2023 10:00:00", "Покупка: Raif 1", 15.0, "", 15.0, 0],
+            ],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.TEST_FILES_DIR, ignore_errors=True)
+
+    def _merged_rows(self):
+        with open(self.output_path, newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def test_account_name(self):
+        self.assertEqual(account_name("dir/privat_card.xlsx"), "privat_card")
+
+    def test_merge_sorts_by_date_and_time(self):
+        for run_size in (1, 2, 1000):
+            with self.subTest(run_size=run_size):
+                written = merge_statements(
+                    [self.privat_path, self.raif_path],
+                    self.output_path,
+                    run_size=run_size,
+                )
+                self.assertEqual(written, 5)
+                self.assertEqual(
+                    self._merged_rows(),
+                    [
+                        ["Date", "Details", "Sum", "Account"],
+                        [
+                            "2023/01/01",
+                            "Privat 0 <Cat> 08:00:00",
+                            "-5.00",
+                            "privat_card",
+                        ],
+                        [
+                            "2023/01/01",
+                            "Raif 1 <Покупка> 10:00:00",
+                            "-15.00",
+                            "raif_card",
+                        ],
+                        [
+                            "2023/01/01",
+                            "Privat 1 <Cat> 12:00:00",
+                            "-10.00",
+                            "privat_card",
+                        ],
+                        [
+                            "2023/01/02",
+                            "Raif 2 <Покупка> 10:00:00",
+                            "-20.00",
+                            "raif_card",
+                        ],
+                        [
+                            "2023/01/03",
+                            "Privat 3 <Cat> 09:00:00",
+                            "-30.00",
+                            "privat_card",
+                        ],
+                    ],
+                )
+
+    def test_merge_in_several_passes_matches(self):
+        inputs = [self.privat_path, self.raif_path]
+        merge_statements(inputs, self.output_path)
+        expected = self._merged_rows()
+        # One record per run: 5 runs take three passes with fan_in 2
+        with mock.patch("merge._merge_runs", wraps=merge._merge_runs) as merge_runs:
+            merge_statements(inputs, self.output_path, run_size=1, fan_in=2)
+        self.assertEqual(self._merged_rows(), expected)
+        self.assertLessEqual(max(len(c.args[0]) for c in merge_runs.call_args_list), 2)
+        self.assertEqual(merge_runs.call_count, 6)
+
+    def test_merge_stream_mode_matches(self):
+        merge_statements([self.privat_path, self.raif_path], self.output_path)
+        expected = self._merged_rows()
+        merge_statements(
+            [self.privat_path, self.raif_path], self.output_path, stream=True
+        )
+        self.assertEqual(self._merged_rows(), expected)
+
+    def test_merge_reports_failing_input(self):
+        missing = os.path.join(self.TEST_FILES_DIR, "missing.xlsx")
+        with self.assertRaisesRegex(ValueError, "missing.xlsx"):
+            merge_statements([self.privat_path, missing], self.output_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from money import (
+    format_minor,
+    rate_minor,
+    rate_minor_column,
+    to_minor,
+    to_minor_column,
+)
+
+
+class TestMoney(unittest.TestCase):
+    def test_to_minor(self):
+        self.assertEqual(to_minor(12.34), 1234)
+        self.assertEqual(to_minor(-0.29), -29)
+        self.assertEqual(to_minor("100.5"), 10050)
+        self.assertEqual(to_minor(7), 700)
+        self.assertEqual(to_minor(float("nan")), 0)
+        self.assertEqual(
+            to_minor_column([12.34, -0.29, 1e9 + 0.01, float("nan")]).tolist(),
+            [1234, -29, 100000000001, 0],
+        )
+
+    def test_format_minor(self):
+        for minor, text in [
+            (1234, "12.34"),
+            (-5, "-0.05"),
+            (0, "0.00"),
+            (-100, "-1.00"),
+        ]:
+            with self.subTest(minor=minor):
+                self.assertEqual(format_minor(minor), text)
+
+    def test_format_minor_is_exact(self):
+        rng = np.random.default_rng(0)
+        values = rng.integers(-(10**15) + 1, 10**15, 5000).tolist()
+        values += [10**15, -(10**15), 10**20 + 5, 999999999999999]
+        for minor in values:
+            units, cents = divmod(abs(minor), 100)
+            sign = "-" if minor < 0 else ""
+            self.assertEqual(format_minor(minor), f"{sign}{units}.{cents:02d}")
+
+    def test_zero_is_never_negative(self):
+        self.assertEqual(format_minor(-abs(to_minor(0.0))), "0.00")
+
+    def test_rate_rounds_half_to_even_exactly(self):
+        # 10.35 / 2 = 5.175 exactly; in floats it is 5.17499... and prints 5.17
+        self.assertEqual(f"{10.35 / 2:.2f}", "5.17")
+        self.assertEqual(format_minor(rate_minor(1035, 200)), "5.18")
+        self.assertEqual(format_minor(rate_minor(1025, 200)), "5.12")
+        self.assertEqual(format_minor(rate_minor(-1035, 200)), "-5.18")
+        self.assertEqual(rate_minor(100, 0), 0)
+
+    def test_vectorized_matches_scalar(self):
+        rng = np.random.default_rng(0)
+        numerators = rng.integers(-(10**9), 10**9, 5000)
+        denominators = rng.integers(-(10**6), 10**6, 5000)
+        denominators[:10] = 0
+        self.assertEqual(
+            rate_minor_column(numerators, denominators).tolist(),
+            [rate_minor(int(n), int(d)) for n, d in zip(numerators, denominators)],
+        )
+        amounts = np.round(rng.uniform(-(10**7), 10**7, 5000), 2)
+        self.assertEqual(
+            to_minor_column(amounts).tolist(), [to_minor(a) for a in amounts]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
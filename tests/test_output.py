@@ -1,7 +1,22 @@
 import unittest
 import os
 import csv
-from output import write_csv  # Assuming output.py is in the root or PYTHONPATH
+import datetime
+import importlib.util
+from decimal import Decimal
+from unittest import mock
+
+import pandas as pd
+
+from output import (  # Assuming output.py is in the root or PYTHONPATH
+    concat_outputs,
+    write_columnar,
+    write_csv,
+    write_output,
+    write_rows,
+)
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
 
 
 class TestOutput(unittest.TestCase):
@@ -82,6 +97,187 @@ class TestOutput(unittest.TestCase):
             self.assertEqual(lines[1].strip(), "2023/02/01,Item A,10.00")
             self.assertEqual(len(lines), 2)  # Header + 1 data row
 
+    def test_write_csv_consumes_generator_in_chunks(self):
+        consumed = []
+
+        def records():
+            for i in range(5):
+                consumed.append(i)
+                yield {"Date": "2023/01/0%d" % (i + 1), "Details": "Op", "Sum": "1.00"}
+
+        write_csv(records(), self.output_file_path, chunk_size=2)
+        self.assertEqual(consumed, [0, 1, 2, 3, 4])
+
+        with open(
+            self.output_file_path, mode="r", newline="", encoding="utf-8"
+        ) as csvfile:
+            rows = list(csv.reader(csvfile))
+        self.assertEqual(rows[0], ["Date", "Details", "Sum"])
+        self.assertEqual(
+            [row[0] for row in rows[1:]],
+            ["2023/01/01", "2023/01/02", "2023/01/03", "2023/01/04", "2023/01/05"],
+        )
+
+    def test_write_csv_append_keeps_single_header(self):
+        first = [{"Date": "2023/01/01", "Details": "Op 1", "Sum": "1.00"}]
+        second = [{"Date": "2023/01/02", "Details": "Op 2", "Sum": "2.00"}]
+        self.assertEqual(write_csv(first, self.output_file_path, append=True), 1)
+        self.assertEqual(write_csv(second, self.output_file_path, append=True), 1)
+
+        with open(
+            self.output_file_path, mode="r", newline="", encoding="utf-8"
+        ) as csvfile:
+            rows = list(csv.reader(csvfile))
+        self.assertEqual(
+            rows,
+            [
+                ["Date", "Details", "Sum"],
+                ["2023/01/01", "Op 1", "1.00"],
+                ["2023/01/02", "Op 2", "2.00"],
+            ],
+        )
+
+    def test_write_rows_matches_dict_writer_bytes(self):
+        records = [
+            {"Date": "2023/01/01", "Details": 'Op, with "quotes"', "Sum": "-1.50"},
+            {"Date": "2023/01/02", "Details": "Multi\nline", "Sum": "2.00"},
+            {"Date": "2023/01/03", "Details": "Тест <Категорія>"},
+        ]
+        expected_path = os.path.join(self.TEST_FILES_DIR, "expected.csv")
+        with open(expected_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["Date", "Details", "Sum"])
+            writer.writeheader()
+            writer.writerows(records)
+        with open(expected_path, "rb") as f:
+            expected = f.read()
+        os.remove(expected_path)
+
+        self.assertEqual(write_csv(records, self.output_file_path), 3)
+        with open(self.output_file_path, "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+        rows = [(r["Date"], r["Details"], r.get("Sum", "")) for r in records]
+        self.assertEqual(write_rows(iter(rows), self.output_file_path, 2), 3)
+        with open(self.output_file_path, "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_concat_outputs_keeps_one_header(self):
+        records = [
+            {"Date": "2023/01/01", "Details": "Op 1", "Sum": "-1.50"},
+            {"Date": "2023/01/02", "Details": "Multi\nline", "Sum": "2.00"},
+            {"Date": "2023/01/03", "Details": "Op 3", "Sum": "0.00"},
+        ]
+        parts = []
+        for i, chunk in enumerate((records[:2], [], records[2:])):
+            part = os.path.join(self.TEST_FILES_DIR, f"part-{i}.csv")
+            write_csv(chunk, part)
+            parts.append(part)
+        expected_path = os.path.join(self.TEST_FILES_DIR, "expected.csv")
+        write_csv(records, expected_path)
+        with open(expected_path, "rb") as f:
+            expected = f.read()
+
+        concat_outputs(parts, self.output_file_path)
+        for path in parts + [expected_path]:
+            os.remove(path)
+        with open(self.output_file_path, "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_write_output_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_output([], self.output_file_path, "xml")
+
+    def test_write_columnar_without_pyarrow(self):
+        with mock.patch.dict("sys.modules", {"pyarrow": None}):
+            with self.assertRaisesRegex(ImportError, "pip install pyarrow"):
+                write_columnar([], self.output_file_path)
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+class TestColumnarOutput(unittest.TestCase):
+    TEST_FILES_DIR = "test_files"
+
+    RECORDS = [
+        {"Date": "2023/01/01", "Details": "Transaction 1", "Sum": "100.00"},
+        {"Date": "2023/01/02", "Details": "Transaction 2", "Sum": "-50.25"},
+        {"Date": "2023/01/03", "Details": "Transaction 3", "Sum": "0.00"},
+    ]
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+        self.output_paths = []
+
+    def tearDown(self):
+        for path in self.output_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        if os.path.exists(self.TEST_FILES_DIR) and not os.listdir(self.TEST_FILES_DIR):
+            os.rmdir(self.TEST_FILES_DIR)
+
+    def _path(self, name):
+        path = os.path.join(self.TEST_FILES_DIR, name)
+        self.output_paths.append(path)
+        return path
+
+    def _assert_typed_table(self, table):
+        import pyarrow as pa
+
+        self.assertEqual(table.schema.field("Date").type, pa.date32())
+        self.assertEqual(table.schema.field("Details").type, pa.string())
+        self.assertEqual(table.schema.field("Sum").type, pa.decimal128(18, 2))
+        self.assertEqual(
+            table.to_pydict(),
+            {
+                "Date": [
+                    datetime.date(2023, 1, 1),
+                    datetime.date(2023, 1, 2),
+                    datetime.date(2023, 1, 3),
+                ],
+                "Details": ["Transaction 1", "Transaction 2", "Transaction 3"],
+                "Sum": [Decimal("100.00"), Decimal("-50.25"), Decimal("0.00")],
+            },
+        )
+
+    def test_write_parquet(self):
+        import pyarrow.parquet as pq
+
+        path = self._path("output_test.parquet")
+        written = write_output(iter(self.RECORDS), path, "parquet", chunk_size=2)
+        self.assertEqual(written, 3)
+        self._assert_typed_table(pq.read_table(path))
+
+    def test_write_arrow_can_be_memory_mapped(self):
+        import pyarrow as pa
+
+        path = self._path("output_test.arrow")
+        self.assertEqual(write_output(self.RECORDS, path, "arrow", chunk_size=2), 3)
+        with pa.memory_map(path) as source:
+            self._assert_typed_table(pa.ipc.open_file(source).read_all())
+
+    def test_concat_columnar_outputs(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for output_format in ("parquet", "arrow"):
+            parts = [self._path(f"part-{i}.{output_format}") for i in range(2)]
+            write_output(self.RECORDS[:1], parts[0], output_format)
+            write_output(self.RECORDS[1:], parts[1], output_format, chunk_size=1)
+            path = self._path(f"joined.{output_format}")
+            concat_outputs(parts, path, output_format)
+            if output_format == "parquet":
+                self._assert_typed_table(pq.read_table(path))
+            else:
+                with pa.memory_map(path) as source:
+                    self._assert_typed_table(pa.ipc.open_file(source).read_all())
+
+    def test_write_columnar_from_dataframe(self):
+        import pyarrow.parquet as pq
+
+        path = self._path("output_frame.parquet")
+        df = pd.DataFrame(self.RECORDS)
+        self.assertEqual(write_columnar(df, path, "parquet"), 3)
+        self._assert_typed_table(pq.read_table(path))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,9 @@ import os
 import datetime
 import pandas as pd  # Required for process_privat, and potentially for type hints if used
 from processor_privat import process as process_privat
+from processor_privat import iter_records as iter_privat
+from processor_privat import stream as stream_privat
+from processor_privat import _process_columns, _process_rows
 from tests.test_utils import create_excel_file
 
 
@@ -71,7 +74,7 @@ class TestProcessorPrivat(unittest.TestCase):
         excel_data = [self.PRIVAT_DETECTION_ROW, header] + data_rows
         create_excel_file(filepath, "Sheet1", excel_data)
 
-        result = process_privat(filepath)
+        result = [record.as_dict() for record in process_privat(filepath)]
 
         self.assertEqual(len(result), 3)  # Row with None date should be skipped
         self.assertEqual(
@@ -113,7 +116,7 @@ class TestProcessorPrivat(unittest.TestCase):
         excel_data = [self.PRIVAT_DETECTION_ROW, header] + data_rows
         create_excel_file(filepath, "Sheet1", excel_data)
 
-        result = process_privat(filepath)
+        result = [record.as_dict() for record in process_privat(filepath)]
         self.assertEqual(len(result), 1)
         self.assertEqual(
             result[0],
@@ -158,7 +161,7 @@ class TestProcessorPrivat(unittest.TestCase):
         excel_data = [self.PRIVAT_DETECTION_ROW, header] + data_rows
         create_excel_file(filepath, "Sheet1", excel_data)
 
-        result = process_privat(filepath)
+        result = [record.as_dict() for record in process_privat(filepath)]
         self.assertEqual(len(result), 2)
         self.assertEqual(
             result[0],
@@ -192,9 +195,147 @@ class TestProcessorPrivat(unittest.TestCase):
         excel_data = [self.PRIVAT_DETECTION_ROW, header]
         create_excel_file(filepath, "Sheet1", excel_data)
 
-        result = process_privat(filepath)
+        result = [record.as_dict() for record in process_privat(filepath)]
         self.assertEqual(result, [])
 
+    def test_process_privat_columnar_matches_row_loop(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "privat_parity.xlsx")
+        header = [
+            "Дата",
+            "Опис операції",
+            "Категорія",
+            "Валюта картки",
+            "Сума в валюті картки",
+            "Валюта транзакції",
+            "Сума в валюті транзакції",
+        ]
+        data_rows = [
+            [
+                "01.01.2023 10:00:00",
+                "Payment",
+                "Products",
+                "UAH",
+                -100.5,
+                "UAH",
+                -100.5,
+            ],
+            ["13.01.2023 23:59:59", "Abroad", "Travel", "UAH", -412.3, "EUR", -10.0],
+            [None, "Skipped", "Junk", "UAH", -1.0, "UAH", -1.0],
+            ["14.01.2023 00:00:00", "Zero trans", " ", "UAH", -5.0, "USD", 0.0],
+            ["15.01.2023 08:15:30", 12345, None, "USD", 7.125, "USD", 7.125],
+            ["16.01.2023 09:00:00", "Refund", "Income", "UAH", 0.0, "PLN", 0.0],
+        ]
+        excel_data = [self.PRIVAT_DETECTION_ROW, header] + data_rows
+        create_excel_file(filepath, "Sheet1", excel_data)
+
+        df = pd.read_excel(filepath, header=1)
+        self.assertEqual(_process_columns(df), _process_rows(df))
+        self.assertEqual(len(_process_columns(df)), 5)
+
+    def test_process_privat_exact_fx_rate(self):
+        # 10.35 / 2.00 is exactly 5.175; float division gives 5.17499...
+        df = pd.DataFrame(
+            {
+                "Дата": ["02.01.2023 12:30:00"],
+                "Опис операції": ["Abroad"],
+                "Валюта картки": ["UAH"],
+                "Сума в валюті картки": [-10.35],
+                "Валюта транзакції": ["USD"],
+                "Сума в валюті транзакції": [-2.0],
+            }
+        )
+        expected = [
+            {
+                "Date": "2023/01/02",
+                "Details": "Abroad 12:30:00 (-2.00 USD @ 5.18)",
+                "Sum": "-10.35",
+            }
+        ]
+        self.assertEqual([r.as_dict() for r in _process_columns(df)], expected)
+        self.assertEqual([r.as_dict() for r in _process_rows(df)], expected)
+
+    def test_process_privat_columnar_mixed_date_formats(self):
+        df = pd.DataFrame(
+            {
+                "Дата": [
+                    "02.01.2023 12:30:00",
+                    datetime.datetime(2023, 1, 3, 7, 5, 0),
+                    "2023-01-04 18:00:00",
+                ],
+                "Опис операції": ["A", "B", "C"],
+                "Валюта картки": ["UAH", "UAH", "UAH"],
+                "Сума в валюті картки": [-1.0, -2.0, -3.0],
+                "Валюта транзакції": ["UAH", "UAH", "UAH"],
+                "Сума в валюті транзакції": [-1.0, -2.0, -3.0],
+            }
+        )
+        self.assertEqual(_process_columns(df), _process_rows(df))
+
+    def test_stream_privat_matches_process(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "privat_stream.xlsx")
+        header = [
+            "Дата",
+            "Опис операції",
+            "Категорія",
+            "Валюта картки",
+            "Сума в валюті картки",
+            "Валюта транзакції",
+            "Сума в валюті транзакції",
+        ]
+        data_rows = [
+            [
+                "01.01.2023 10:00:00",
+                "Payment",
+                "Products",
+                "UAH",
+                -100.5,
+                "UAH",
+                -100.5,
+            ],
+            ["13.01.2023 23:59:59", "Abroad", None, "UAH", -412.3, "EUR", -10.0],
+            [None, "Skipped", "Junk", "UAH", -1.0, "UAH", -1.0],
+            ["15.01.2023 08:15:30", 12345, "", "USD", 7, "USD", 7],
+        ]
+        excel_data = [self.PRIVAT_DETECTION_ROW, header] + data_rows
+        create_excel_file(filepath, "Sheet1", excel_data)
+
+        streamed = stream_privat(filepath)
+        self.assertFalse(isinstance(streamed, list))
+        self.assertEqual(list(streamed), process_privat(filepath))
+
+    def test_iter_records_privat_chunks_match_process(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "privat_chunks.xlsx")
+        header = [
+            "Дата",
+            "Опис операції",
+            "Категорія",
+            "Валюта картки",
+            "Сума в валюті картки",
+            "Валюта транзакції",
+            "Сума в валюті транзакції",
+        ]
+        data_rows = [
+            [
+                "%02d.01.2023 10:00:00" % day,
+                "Op %d" % day,
+                None,
+                "UAH",
+                -day,
+                "UAH",
+                -day,
+            ]
+            for day in range(1, 8)
+        ]
+        data_rows[3][0] = None
+        excel_data = [self.PRIVAT_DETECTION_ROW, header] + data_rows
+        create_excel_file(filepath, "Sheet1", excel_data)
+
+        records = iter_privat(filepath, chunk_size=2)
+        self.assertFalse(isinstance(records, list))
+        records = list(records)
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records, process_privat(filepath))
+
     def test_process_privat_file_no_header(self):
         filepath = os.path.join(self.TEST_FILES_DIR, "privat_no_header.xlsx")
         # The "header" that process_privat will try to read (row 2 of excel) is not the expected one.
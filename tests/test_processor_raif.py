@@ -1,7 +1,11 @@
 import unittest
 import os
+from unittest import mock
 import pandas as pd  # Though not directly used in tests, processor_raif uses it.
 from processor_raif import process as process_raif
+from processor_raif import iter_records as iter_raif
+from processor_raif import stream as stream_raif
+from processor_raif import _process_columns, _process_rows
 from tests.test_utils import create_excel_file
 
 
@@ -85,7 +89,7 @@ class TestProcessorRaif(unittest.TestCase):
             "raif_typical.xlsx", header_location_data, actual_header, data_rows
         )
 
-        result = process_raif(filepath)
+        result = [record.as_dict() for record in process_raif(filepath)]
 
         self.assertEqual(len(result), 5)
         self.assertEqual(
@@ -146,7 +150,7 @@ class TestProcessorRaif(unittest.TestCase):
         filepath = self._create_raif_excel(
             "raif_header_middle.xlsx", header_location_data, actual_header, data_rows
         )
-        result = process_raif(filepath)
+        result = [record.as_dict() for record in process_raif(filepath)]
 
         self.assertEqual(len(result), 1)
         self.assertEqual(
@@ -170,7 +174,7 @@ class TestProcessorRaif(unittest.TestCase):
         filepath = self._create_raif_excel(
             "raif_missing_cols.xlsx", header_location_data, actual_header, data_rows
         )
-        result = process_raif(filepath)
+        result = [record.as_dict() for record in process_raif(filepath)]
 
         self.assertEqual(len(result), 1)
         self.assertEqual(
@@ -212,7 +216,7 @@ class TestProcessorRaif(unittest.TestCase):
             actual_header,
             data_rows,
         )
-        result = process_raif(filepath)
+        result = [record.as_dict() for record in process_raif(filepath)]
 
         self.assertEqual(len(result), 4)
         self.assertEqual(
@@ -248,6 +252,121 @@ class TestProcessorRaif(unittest.TestCase):
             },
         )
 
+    def test_process_raif_columnar_matches_row_loop(self):
+        header_location_data = [["АТ «Райффайзен Банк»"], ["Some other info"]]
+        actual_header = [
+            self.RAIF_HEADER_KEY,
+            "Деталі операції",
+            "Сума у валюті операції",
+            "Валюта",
+            "Сума у валюті рахунку",
+            "Сума кешбеку",
+        ]
+        data_rows = [
+            ["01/13/2023 10:15:00", "Покупка: Groceries", 150.0, "UAH", 150.0, 0],
+            ["01/14/2023 11:00:00", "Повернення: Refund", 20.0, "USD", 830.5, 1.25],
+            ["01/15/2023 12:00:00", "Поповнення: Top up", 500.0, None, 500.0, None],
+            ["01/16/2023 13:00:00", "No category here", 42.0, "UAH", -42.0, 0],
+            [None, "Покупка: Skipped", 1.0, "UAH", 1.0, 0],
+            ["01/17/2023 14:00:00", " : Empty category", 0.0, "EUR", 10.0, 0.5],
+            ["01/18/2023 15:00:00", "Кешбек: Monthly", 3.0, " UAH ", 3.0, 0],
+            ["01/19/2023 16:00:00", "Покупка: A: B", -7.5, "PLN", -75.0, 0],
+        ]
+        filepath = self._create_raif_excel(
+            "raif_parity.xlsx", header_location_data, actual_header, data_rows
+        )
+
+        df = pd.read_excel(filepath, header=2)
+        self.assertEqual(_process_columns(df), _process_rows(df))
+        self.assertEqual(len(_process_columns(df)), 7)
+
+    def test_process_raif_columnar_missing_optional_columns(self):
+        df = pd.DataFrame(
+            {
+                self.RAIF_HEADER_KEY: ["07/15/2023 09:00:00", "07/16/2023 10:00:00"],
+                "Деталі операції": ["Simple Purchase", "Повернення: Back"],
+                "Сума у валюті рахунку": [250.0, 12.0],
+            }
+        )
+        self.assertEqual(_process_columns(df), _process_rows(df))
+
+    def test_process_raif_reads_workbook_once(self):
+        header_location_data = [["АТ «Райффайзен Банк»"], [None], ["Period"]]
+        actual_header = [
+            self.RAIF_HEADER_KEY,
+            "Деталі операції",
+            "Сума у валюті операції",
+            "Валюта",
+            "Сума у валюті рахунку",
+            "Сума кешбеку",
+            None,
+        ]
+        data_rows = [
+            ["03/01/2023 10:00:00", "Покупка: Shop", 10.0, "USD", 412.0, 0, "x"],
+            [None, None, None, None, None, None, None],
+            ["03/02/2023 11:00:00", "Поповнення: Salary", 100, "UAH", 100, 0, 1],
+        ]
+        filepath = self._create_raif_excel(
+            "raif_single_read.xlsx", header_location_data, actual_header, data_rows
+        )
+
+        with mock.patch(
+            "processor_raif.pd.read_excel", wraps=pd.read_excel
+        ) as read_excel:
+            result = process_raif(filepath)
+        self.assertEqual(read_excel.call_count, 1)
+
+        expected = _process_rows(pd.read_excel(filepath, header=3))
+        self.assertEqual(result, expected)
+        self.assertEqual(len(result), 2)
+
+    def test_stream_raif_matches_process(self):
+        header_location_data = [["АТ «Райффайзен Банк»"], ["Some other info"]]
+        actual_header = [
+            self.RAIF_HEADER_KEY,
+            "Деталі операції",
+            "Сума у валюті операції",
+            "Валюта",
+            "Сума у валюті рахунку",
+            "Сума кешбеку",
+        ]
+        data_rows = [
+            ["01/13/2023 10:15:00", "Покупка: Groceries", 150.0, "UAH", 150.0, 0],
+            ["01/14/2023 11:00:00", "Повернення: Refund", 20.0, "USD", 830.5, 1.25],
+            [None, "Покупка: Skipped", 1.0, "UAH", 1.0, 0],
+            ["01/15/2023 12:00:00", "Plain text", 500.0, None, 500.0, None],
+        ]
+        filepath = self._create_raif_excel(
+            "raif_stream.xlsx", header_location_data, actual_header, data_rows
+        )
+
+        self.assertEqual(list(stream_raif(filepath)), process_raif(filepath))
+
+    def test_stream_raif_no_header_match(self):
+        filepath = self._create_raif_excel(
+            "raif_stream_no_header.xlsx", [["АТ «Райффайзен Банк»"], ["None"]], [], []
+        )
+        with self.assertRaises(ValueError):
+            list(stream_raif(filepath))
+
+    def test_iter_records_raif_chunks_match_process(self):
+        actual_header = [
+            self.RAIF_HEADER_KEY,
+            "Деталі операції",
+            "Сума у валюті рахунку",
+        ]
+        data_rows = [
+            ["06/%02d/2023 09:00:00" % day, "Покупка: Item %d" % day, day]
+            for day in range(1, 6)
+        ]
+        filepath = self._create_raif_excel(
+            "raif_chunks.xlsx", [["АТ «Райффайзен Банк»"]], actual_header, data_rows
+        )
+
+        records = list(iter_raif(filepath, chunk_size=2))
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records, process_raif(filepath))
+
     def test_process_raif_empty_file_no_header_match(self):
         header_location_data = [["АТ «Райффайзен Банк»"], ["No header here really"]]
         # actual_header_row is empty or not containing RAIF_HEADER_KEY
@@ -270,7 +389,7 @@ class TestProcessorRaif(unittest.TestCase):
         filepath = self._create_raif_excel(
             "raif_header_no_data.xlsx", header_location_data, actual_header, data_rows
         )
-        result = process_raif(filepath)
+        result = [record.as_dict() for record in process_raif(filepath)]
 
         self.assertEqual(result, [])
 
@@ -0,0 +1,48 @@
+import unittest
+import os
+import subprocess
+import processor_privat
+import processor_raif
+import registry
+
+
+class TestRegistry(unittest.TestCase):
+    def test_signatures_are_read_from_processor_modules(self):
+        found = registry.signatures()
+        self.assertEqual(found["privat"], processor_privat.SIGNATURE)
+        self.assertEqual(found["raif"], processor_raif.SIGNATURE)
+
+    def test_detect_matches_any_registered_signature(self):
+        self.assertEqual(
+            registry.detect("Виписка з Ваших карток за період 01.01-31.01"), "privat"
+        )
+        self.assertEqual(registry.detect("АТ «Райффайзен Банк»"), "raif")
+        self.assertIsNone(registry.detect("Some unknown header"))
+        self.assertIsNone(registry.detect(12345))
+
+    def test_load_processor(self):
+        self.assertIs(registry.load_processor("privat"), processor_privat)
+        with self.assertRaises(ValueError):
+            registry.load_processor("unknown")
+
+    def test_detection_imports_no_processor(self):
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        code = (
+            "import sys, registry\n"
+            "assert registry.detect('АТ «Райффайзен Банк»') == 'raif'\n"
+            "print(sorted(m for m in sys.modules if m.startswith('processor_')))\n"
+            "registry.load_processor('raif')\n"
+            "print(sorted(m for m in sys.modules if m.startswith('processor_')))\n"
+            "print('pandas' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            ["python", "-c", code], capture_output=True, text=True, cwd=project_root
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertEqual(
+            result.stdout.splitlines(), ["[]", "['processor_raif']", "True"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,8 @@
 import unittest
 import os
 import pandas as pd
-from structure_detector import detect_structure
-from tests.test_utils import create_excel_file
+from structure_detector import detect_sheets, detect_structure
+from tests.test_utils import create_excel_file, create_excel_workbook
 
 
 class TestStructureDetector(unittest.TestCase):
@@ -51,6 +51,21 @@ class TestStructureDetector(unittest.TestCase):
         with self.assertRaises(ValueError):  # Or IndexError, or specific custom error
             detect_structure(filepath)
 
+    def test_detect_sheets(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "multi_sheet.xlsx")
+        create_excel_workbook(
+            filepath,
+            {
+                "Summary": [["Totals"], [1, 2]],
+                "Card": [["Виписка з Ваших карток за період..."]],
+                "Empty": [[None, "x"]],
+                "Account": [["АТ «Райффайзен Банк»"]],
+            },
+        )
+        self.assertEqual(
+            detect_sheets(filepath), [("Card", "privat"), ("Account", "raif")]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
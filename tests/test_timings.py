@@ -0,0 +1,67 @@
+import unittest
+import time
+import timings
+
+
+class TestTimings(unittest.TestCase):
+    def tearDown(self):
+        timings.stop()
+
+    def test_helpers_are_noops_when_off(self):
+        records = [1, 2, 3]
+        self.assertIs(timings.timed_iter(records, "process"), records)
+        with timings.stage("detect"):
+            pass
+        timings.add_rows("detect", 1)
+        self.assertIsNone(timings.stop())
+
+    def test_nested_stage_time_is_not_counted_twice(self):
+        collected = timings.start()
+        with timings.stage("outer"):
+            time.sleep(0.02)
+            with timings.stage("inner"):
+                time.sleep(0.05)
+        stages = timings.stop().as_dict()
+
+        self.assertIs(timings.stop(), None)
+        self.assertGreaterEqual(stages["inner"]["seconds"], 0.05)
+        self.assertGreaterEqual(stages["outer"]["seconds"], 0.02)
+        self.assertLess(stages["outer"]["seconds"], 0.05)
+        self.assertEqual(stages, collected.as_dict())
+
+    def test_timed_iter_counts_rows_and_excludes_consumer_time(self):
+        timings.start()
+
+        def produce():
+            for i in range(3):
+                time.sleep(0.01)
+                yield i
+
+        with timings.stage("write_csv"):
+            for _ in timings.timed_iter(produce(), "process"):
+                time.sleep(0.02)
+        stages = timings.stop().as_dict()
+
+        self.assertEqual(stages["process"]["rows"], 3)
+        self.assertGreaterEqual(stages["process"]["seconds"], 0.03)
+        self.assertLess(stages["process"]["seconds"], 0.06)
+        self.assertGreaterEqual(stages["write_csv"]["seconds"], 0.06)
+
+    def test_combine_adds_up_stages(self):
+        first = {"read_excel": {"seconds": 1.0, "calls": 1, "rows": 10}}
+        second = {
+            "read_excel": {"seconds": 0.5, "calls": 2, "rows": 5},
+            "process": {"seconds": 0.25, "calls": 3, "rows": 4},
+        }
+        self.assertEqual(
+            timings.combine([first, None, second]),
+            {
+                "read_excel": {"seconds": 1.5, "calls": 3, "rows": 15},
+                "process": {"seconds": 0.25, "calls": 3, "rows": 4},
+            },
+        )
+        self.assertIsNone(timings.combine([None, None]))
+
+
+if __name__ == "__main__":
+    unittest.main()
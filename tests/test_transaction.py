@@ -0,0 +1,73 @@
+import unittest
+
+from transaction import Transaction, fx_suffix, record_row
+
+
+class TestTransaction(unittest.TestCase):
+    def test_details_and_sum_are_formatted_from_fields(self):
+        transaction = Transaction(
+            "2023/02/20",
+            "12:30:00",
+            "Return",
+            "Повернення",
+            7500,
+            original_amount=20000,
+            original_currency="EUR",
+            fx_rate=38,
+            cashback=150,
+        )
+        self.assertEqual(
+            transaction.as_dict(),
+            {
+                "Date": "2023/02/20",
+                "Details": "Return <Повернення> 12:30:00 (200.00 EUR @ 0.38) "
+                "[cashback 1.50]",
+                "Sum": "75.00",
+            },
+        )
+
+    def test_fx_suffix_is_formatted_once_per_rate(self):
+        fx_suffix.cache_clear()
+        for amount in (-100, -250, 300):
+            transaction = Transaction(
+                "2023/01/03",
+                "15:00:00",
+                "Shop",
+                amount=amount * 41,
+                original_amount=amount,
+                original_currency="USD",
+                fx_rate=4100,
+            )
+            self.assertTrue(transaction.details.endswith(" USD @ 41.00)"))
+        info = fx_suffix.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+    def test_plain_transaction(self):
+        transaction = Transaction("2023/01/03", "15:00:00", "Coffee", amount=-2575)
+        self.assertEqual(
+            transaction.as_row(), ("2023/01/03", "Coffee 15:00:00", "-25.75")
+        )
+
+    def test_uses_slots(self):
+        transaction = Transaction("2023/01/03", "15:00:00", "Coffee")
+        self.assertFalse(hasattr(transaction, "__dict__"))
+        with self.assertRaises(AttributeError):
+            transaction.balance = 0
+
+    def test_equality(self):
+        first = Transaction("2023/01/03", "15:00:00", "Coffee", amount=-100)
+        self.assertEqual(
+            first, Transaction("2023/01/03", "15:00:00", "Coffee", "", -100)
+        )
+        self.assertNotEqual(first, Transaction("2023/01/03", "15:00:00", "Coffee"))
+        self.assertNotEqual(first, first.as_dict())
+
+    def test_record_row_accepts_dicts(self):
+        self.assertEqual(
+            record_row({"Sum": "1.00", "Date": "2023/01/01"}),
+            ("2023/01/01", "", "1.00"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,3 +18,18 @@ def create_excel_file(filepath: str, sheet_name: str, data: list[list]):
         print(f"Excel file created successfully at {filepath}")
     except Exception as e:
         print(f"Error creating Excel file: {e}")
+
+
+def create_excel_workbook(filepath: str, sheets: dict[str, list[list]]):
+    """
+    Creates an Excel (XLSX) file with one sheet per entry of sheets, in order.
+
+    Args:
+        filepath: The path where the Excel file will be created.
+        sheets: Maps sheet names to lists of lists representing rows of data.
+    """
+    with pd.ExcelWriter(filepath) as writer:
+        for sheet_name, data in sheets.items():
+            pd.DataFrame(data).to_excel(
+                writer, sheet_name=sheet_name, index=False, header=False
+            )
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import shutil
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from watch import FolderWatcher, watch
+
+
+class TestFolderWatcher(unittest.TestCase):
+    TEST_FILES_DIR = "test_files_watch"
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.TEST_FILES_DIR, ignore_errors=True)
+
+    def _write(self, name, content="statement"):
+        path = os.path.join(self.TEST_FILES_DIR, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def _watcher(self):
+        return FolderWatcher(self.TEST_FILES_DIR, (".xls", ".xlsx"), ".csv", settle=2)
+
+    def test_file_is_ready_once_it_stops_changing(self):
+        watcher = self._watcher()
+        path = self._write("a.xlsx")
+        self.assertEqual(watcher.poll(now=0), [])
+        self.assertEqual(watcher.poll(now=1), [])
+        self.assertEqual(watcher.poll(now=2), [path])
+        # Reported once per version of the file
+        self.assertEqual(watcher.poll(now=10), [])
+
+    def test_changing_file_is_debounced(self):
+        watcher = self._watcher()
+        path = self._write("a.xlsx", "part")
+        self.assertEqual(watcher.poll(now=0), [])
+        self._write("a.xlsx", "partial write")
+        self.assertEqual(watcher.poll(now=2), [])
+        self.assertEqual(watcher.poll(now=4), [path])
+
+        # A new version of the file is converted again
+        self._write("a.xlsx", "updated statement")
+        self.assertEqual(watcher.poll(now=5), [])
+        self.assertEqual(watcher.poll(now=7), [path])
+
+    def test_ignores_other_empty_and_lock_files(self):
+        watcher = self._watcher()
+        self._write("notes.txt")
+        self._write("~$a.xlsx")
+        self._write(".hidden.xls")
+        self._write("empty.xls", "")
+        watcher.poll(now=0)
+        self.assertEqual(watcher.poll(now=5), [])
+
+    def test_skips_files_converted_before_start(self):
+        self._write("a.xlsx")
+        self._write("a.csv", "output")
+        path = self._write("b.xlsx")
+        watcher = self._watcher()
+        watcher.poll(now=0)
+        self.assertEqual(watcher.poll(now=2), [path])
+
+
+class TestWatch(unittest.TestCase):
+    TEST_FILES_DIR = "test_files_watch"
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.TEST_FILES_DIR, ignore_errors=True)
+
+    def test_converts_files_in_the_pool(self):
+        for name in ("a.xlsx", "b.xlsx", "bad.xlsx"):
+            with open(os.path.join(self.TEST_FILES_DIR, name), "w") as f:
+                f.write(name)
+        watcher = FolderWatcher(self.TEST_FILES_DIR, (".xlsx",), ".csv", settle=0)
+
+        def convert(path):
+            if "bad" in path:
+                return None, "Error detecting structure", None
+            output_file = os.path.splitext(path)[0] + ".csv"
+            shutil.copyfile(path, output_file)
+            return output_file, None, None
+
+        results = {}
+
+        async def run():
+            stop = asyncio.Event()
+
+            def on_result(path, output_file, error):
+                results[os.path.basename(path)] = (output_file, error)
+                if len(results) == 3:
+                    stop.set()
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                await asyncio.wait_for(
+                    watch(
+                        watcher,
+                        convert,
+                        executor,
+                        workers=2,
+                        interval=0.01,
+                        on_result=on_result,
+                        stop=stop,
+                    ),
+                    timeout=10,
+                )
+
+        asyncio.run(run())
+        self.assertEqual(
+            results["a.xlsx"], (os.path.join(self.TEST_FILES_DIR, "a.csv"), None)
+        )
+        self.assertEqual(results["bad.xlsx"], (None, "Error detecting structure"))
+        self.assertTrue(os.path.exists(os.path.join(self.TEST_FILES_DIR, "b.csv")))
+
+    def test_maintains_after_conversions(self):
+        watcher = FolderWatcher(self.TEST_FILES_DIR, (".xlsx",), ".csv", settle=0)
+        converted = []
+        maintained = []
+
+        def convert(path):
+            converted.append(path)
+            return None, None, None
+
+        async def run():
+            stop = asyncio.Event()
+
+            def maintain():
+                maintained.append(len(converted))
+                stop.set()
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                task = asyncio.create_task(
+                    watch(
+                        watcher,
+                        convert,
+                        executor,
+                        interval=0.01,
+                        stop=stop,
+                        maintain=maintain,
+                    )
+                )
+                # Nothing converted yet, so nothing to maintain
+                await asyncio.sleep(0.05)
+                self.assertEqual(maintained, [])
+                with open(os.path.join(self.TEST_FILES_DIR, "a.xlsx"), "w") as f:
+                    f.write("a")
+                await asyncio.wait_for(task, timeout=10)
+
+        asyncio.run(run())
+        self.assertEqual(maintained, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+import os
+from unittest import mock
+import pandas as pd
+import math
+from workbook import Workbook, iter_rows, open_workbook, sheet_names
+from structure_detector import detect_structure
+from processor_privat import process as process_privat
+from processor_privat import _process_rows as process_privat_rows
+from processor_raif import process as process_raif
+from tests.test_utils import create_excel_file, create_excel_workbook
+
+
+class TestWorkbook(unittest.TestCase):
+    TEST_FILES_DIR = "test_files"
+
+    def setUp(self):
+        os.makedirs(self.TEST_FILES_DIR, exist_ok=True)
+
+    def tearDown(self):
+        for filename in os.listdir(self.TEST_FILES_DIR):
+            os.remove(os.path.join(self.TEST_FILES_DIR, filename))
+        if not os.listdir(self.TEST_FILES_DIR):
+            os.rmdir(self.TEST_FILES_DIR)
+
+    def _create_privat_file(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "privat_workbook.xlsx")
+        data = [
+            ["Виписка з Ваших карток за період..."],
+            [
+                "Дата",
+                "Опис операції",
+                "Категорія",
+                "Валюта картки",
+                "Сума в валюті картки",
+                "Валюта транзакції",
+                "Сума в валюті транзакції",
+            ],
+            ["01.01.2023 10:00:00", "Op 1", "Cat A", "UAH", -100.0, "UAH", -100.0],
+            ["02.01.2023 12:00:00", "Op 2", None, "USD", -50.0, "EUR", -45.0],
+        ]
+        create_excel_file(filepath, "Sheet1", data)
+        return filepath
+
+    def _create_raif_file(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "raif_workbook.xlsx")
+        data = [
+            ["АТ «Райффайзен Банк»"],
+            [
+                "Дата і час здійснення операції",
+                "Деталі операції",
+                "Сума у валюті рахунку",
+            ],
+            ["01/15/2023 10:15:00", "Покупка: Detail", 150.0],
+        ]
+        create_excel_file(filepath, "Sheet1", data)
+        return filepath
+
+    def test_open_workbook_reuses_instance(self):
+        workbook = Workbook("some.xlsx")
+        self.assertIs(open_workbook(workbook), workbook)
+        self.assertEqual(open_workbook("some.xlsx").path, "some.xlsx")
+
+    def test_sheet_is_parsed_lazily_and_once(self):
+        filepath = self._create_privat_file()
+        with mock.patch("workbook.pd.read_excel", wraps=pd.read_excel) as read_excel:
+            workbook = Workbook(filepath)
+            self.assertEqual(read_excel.call_count, 0)
+            workbook.sheet
+            workbook.sheet
+        self.assertEqual(read_excel.call_count, 1)
+
+    def test_privat_detection_and_processing_share_one_parse(self):
+        filepath = self._create_privat_file()
+        with mock.patch("workbook.pd.read_excel", wraps=pd.read_excel) as read_excel:
+            workbook = Workbook(filepath)
+            self.assertEqual(detect_structure(workbook), "privat")
+            result = process_privat(workbook)
+        self.assertEqual(read_excel.call_count, 1)
+        self.assertEqual(result, process_privat_rows(pd.read_excel(filepath, header=1)))
+
+    def test_raif_detection_and_processing_share_one_parse(self):
+        filepath = self._create_raif_file()
+        with mock.patch("workbook.pd.read_excel", wraps=pd.read_excel) as read_excel:
+            workbook = Workbook(filepath)
+            self.assertEqual(detect_structure(workbook), "raif")
+            result = process_raif(workbook)
+        self.assertEqual(read_excel.call_count, 1)
+        self.assertEqual(
+            [record.as_dict() for record in result],
+            [
+                {
+                    "Date": "2023/01/15",
+                    "Details": "Detail <Покупка> 10:15:00",
+                    "Sum": "-150.00",
+                }
+            ],
+        )
+
+    def test_frame_reads_only_the_given_columns(self):
+        filepath = self._create_privat_file()
+        columns = {"Дата": object, "Сума в валюті картки": "float64", "Missing": object}
+        with mock.patch("workbook.pd.read_excel", wraps=pd.read_excel) as read_excel:
+            df = Workbook(filepath).frame(1, columns)
+        self.assertEqual(read_excel.call_count, 1)
+        self.assertEqual(read_excel.call_args.kwargs["dtype"], columns)
+        self.assertEqual(list(df.columns), ["Дата", "Сума в валюті картки"])
+        self.assertEqual(df["Сума в валюті картки"].dtype, "float64")
+        self.assertEqual(
+            df["Дата"].tolist(), ["01.01.2023 10:00:00", "02.01.2023 12:00:00"]
+        )
+
+    def test_frame_projects_an_already_parsed_sheet(self):
+        filepath = self._create_privat_file()
+        columns = {"Дата": object, "Сума в валюті картки": "float64", "Missing": object}
+        workbook = Workbook(filepath)
+        workbook.sheet
+        with mock.patch("workbook.pd.read_excel", wraps=pd.read_excel) as read_excel:
+            df = workbook.frame(1, columns)
+        self.assertEqual(read_excel.call_count, 0)
+        pd.testing.assert_frame_equal(df, Workbook(filepath).frame(1, columns))
+
+    def test_named_sheet(self):
+        filepath = os.path.join(self.TEST_FILES_DIR, "sheets_workbook.xlsx")
+        create_excel_workbook(
+            filepath,
+            {"First": [["Totals"]], "Second": [["Header"], ["a", 1.5], ["b", 2]]},
+        )
+        self.assertEqual(sheet_names(filepath), ["First", "Second"])
+
+        workbook = Workbook(filepath, sheet="Second")
+        self.assertEqual(workbook.first_row()[0], "Header")
+        self.assertEqual(
+            workbook.frame(0, {"Header": object})["Header"].tolist(), ["a", "b"]
+        )
+        streaming = Workbook(filepath, streaming=True, sheet="Second")
+        self.assertEqual(streaming.first_row()[0], "Header")
+        self.assertEqual(list(iter_rows(filepath, sheet="Second"))[2], ["b", 2])
+
+    def test_iter_rows_converts_cells_like_read_excel(self):
+        filepath = self._create_privat_file()
+        rows = list(iter_rows(filepath))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0][0], "Виписка з Ваших карток за період...")
+        self.assertEqual(rows[2][4], -100)
+        self.assertIsInstance(rows[2][4], int)
+        self.assertTrue(math.isnan(rows[3][2]))
+
+    def test_streaming_workbook_does_not_parse_sheet(self):
+        filepath = self._create_raif_file()
+        with mock.patch("workbook.pd.read_excel", wraps=pd.read_excel) as read_excel:
+            workbook = Workbook(filepath, streaming=True)
+            self.assertEqual(detect_structure(workbook), "raif")
+        self.assertEqual(read_excel.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
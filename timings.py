@@ -0,0 +1,121 @@
+import time
+from contextlib import contextmanager
+
+# Timings being collected for the current conversion, or None when
+# timing is off; the helpers below are no-ops in that case
+_current = None
+
+
+class Timings:
+    """
+    Wall-clock time, number of calls and row counts per pipeline stage.
+    Stages may nest; each stage is charged only its own time, so a
+    read_excel call made while processing is not counted twice.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._children = []
+
+    def _entry(self, name):
+        return self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "rows": 0})
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        self._children.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            entry = self._entry(name)
+            entry["seconds"] += elapsed - children
+            entry["calls"] += 1
+
+    def add_rows(self, name, rows):
+        self._entry(name)["rows"] += rows
+
+    def timed_iter(self, iterable, name):
+        """
+        Yields from iterable, charging the time spent producing each item
+        to the stage name and counting the items as its rows.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            self._entry(name)["rows"] += 1
+            yield item
+
+    def as_dict(self):
+        return {name: dict(entry) for name, entry in self.stages.items()}
+
+
+def start():
+    """
+    Starts collecting timings for a new conversion and returns them.
+    """
+    global _current
+    _current = Timings()
+    return _current
+
+
+def stop():
+    """
+    Stops collecting timings and returns what was collected, or None.
+    """
+    global _current
+    collected, _current = _current, None
+    return collected
+
+
+def stage(name):
+    """
+    Context manager timing a pipeline stage when timing is on.
+    """
+    if _current is None:
+        return _noop()
+    return _current.stage(name)
+
+
+def add_rows(name, rows):
+    if _current is not None:
+        _current.add_rows(name, rows)
+
+
+def timed_iter(iterable, name):
+    """
+    Wraps a record or row iterator so that producing items is timed as
+    stage name; returns the iterable unchanged when timing is off.
+    """
+    if _current is None:
+        return iterable
+    return _current.timed_iter(iterable, name)
+
+
+def combine(stage_dicts):
+    """
+    Adds up several as_dict() results, e.g. of the sheets of one
+    workbook; None entries are skipped. Returns None if all are None.
+    """
+    total = None
+    for stages in stage_dicts:
+        if stages is None:
+            continue
+        total = total or {}
+        for name, entry in stages.items():
+            summed = total.setdefault(name, {"seconds": 0.0, "calls": 0, "rows": 0})
+            for field, value in entry.items():
+                summed[field] += value
+    return total
+
+
+@contextmanager
+def _noop():
+    yield
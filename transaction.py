@@ -0,0 +1,114 @@
+from functools import lru_cache
+
+from money import format_minor
+
+
+class Transaction:
+    """
+    One statement operation as produced by the processors.
+    Amounts are integer minor units and fx_rate is in hundredths (see
+    money.py). The Details and Sum columns are only formatted from these
+    fields when the record is written.
+    original_amount, original_currency and fx_rate are set for operations
+    in a currency other than the account's; cashback is None when there
+    was none.
+    """
+
+    __slots__ = (
+        "date",
+        "time",
+        "description",
+        "category",
+        "amount",
+        "original_amount",
+        "original_currency",
+        "fx_rate",
+        "cashback",
+    )
+
+    def __init__(
+        self,
+        date,
+        time,
+        description,
+        category="",
+        amount=0,
+        original_amount=None,
+        original_currency=None,
+        fx_rate=None,
+        cashback=None,
+    ):
+        self.date = date
+        self.time = time
+        self.description = description
+        self.category = category
+        self.amount = amount
+        self.original_amount = original_amount
+        self.original_currency = original_currency
+        self.fx_rate = fx_rate
+        self.cashback = cashback
+
+    @property
+    def details(self):
+        """
+        The Details column: description, <category>, time, FX conversion
+        and cashback.
+        """
+        if self.category:
+            details = f"{self.description} <{self.category}> {self.time}"
+        else:
+            details = f"{self.description} {self.time}"
+        if self.original_currency is not None:
+            original = format_minor(self.original_amount)
+            details += f" ({original}" + fx_suffix(self.original_currency, self.fx_rate)
+        if self.cashback:
+            details += f" [cashback {format_minor(self.cashback)}]"
+        return details
+
+    @property
+    def sum(self):
+        """
+        The Sum column: signed amount with two decimals.
+        """
+        return format_minor(self.amount)
+
+    def as_row(self):
+        # format_minor directly: write_csv calls this once per row
+        return self.date, self.details, format_minor(self.amount)
+
+    def as_dict(self):
+        return {"Date": self.date, "Details": self.details, "Sum": self.sum}
+
+    def _fields(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, Transaction):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self.__slots__, self._fields())
+        )
+        return f"Transaction({fields})"
+
+
+@lru_cache(maxsize=4096)
+def fx_suffix(currency, rate):
+    """
+    Returns the end of the FX note in Details, e.g. ' USD @ 41.25)'.
+    Rates are in hundredths, so a statement has few distinct rates per
+    currency; each is formatted once instead of once per row.
+    """
+    return f" {currency} @ {format_minor(rate)})"
+
+
+def record_row(record):
+    """
+    Returns the (Date, Details, Sum) values of a Transaction or of a
+    record dict with those keys.
+    """
+    if isinstance(record, Transaction):
+        return record.as_row()
+    return record.get("Date", ""), record.get("Details", ""), record.get("Sum", "")
@@ -0,0 +1,192 @@
+import logging
+import os
+import signal
+import time
+
+# asyncio is imported by the coroutines below: main.py uses
+# is_statement_name for every run, and importing asyncio would add tens
+# of milliseconds to its start-up
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two scans of the watched directory
+DEFAULT_INTERVAL = 1.0
+
+# Seconds a file's size and modification time must stay the same before
+# it is converted, so that files still being copied are not picked up
+DEFAULT_SETTLE = 2.0
+
+
+def is_statement_name(name, extensions):
+    """
+    Tells whether a file name in a statements folder is a statement: it
+    has one of extensions and is neither hidden nor an Excel lock file
+    (~$name.xlsx).
+    """
+    return not name.startswith((".", "~$")) and name.lower().endswith(extensions)
+
+
+class FolderWatcher:
+    """
+    Polls a directory for statement files and reports the ones that are
+    new or changed and have stopped changing for settle seconds.
+    Files whose output is already newer than the statement when the
+    watcher starts are not reported until they change.
+    """
+
+    def __init__(self, directory, extensions, output_extension, settle=DEFAULT_SETTLE):
+        self.directory = directory
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.output_extension = output_extension
+        self.settle = settle
+        # path -> ((size, mtime), time the signature was first seen)
+        self._pending = {}
+        # path -> signature of the file version already queued
+        self._done = {}
+        for path, signature in self._scan().items():
+            if self._is_converted(path):
+                self._done[path] = signature
+
+    def _scan(self):
+        files = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError as e:
+            logger.warning("Cannot list '%s': %s", self.directory, e)
+            return files
+        for entry in entries:
+            if not is_statement_name(entry.name, self.extensions):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.is_file():
+                files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def _is_converted(self, path):
+        output_file = os.path.splitext(path)[0] + self.output_extension
+        try:
+            return os.path.getmtime(output_file) >= os.path.getmtime(path)
+        except OSError:
+            return False
+
+    def poll(self, now=None):
+        """
+        Scans the directory once and returns the paths ready to convert.
+        """
+        now = time.monotonic() if now is None else now
+        files = self._scan()
+        ready = []
+        for path, signature in files.items():
+            if self._done.get(path) == signature:
+                self._pending.pop(path, None)
+                continue
+            seen = self._pending.get(path)
+            if seen is None or seen[0] != signature:
+                self._pending[path] = (signature, now)
+                continue
+            # Empty files are most likely still being created
+            if signature[0] > 0 and now - seen[1] >= self.settle:
+                del self._pending[path]
+                self._done[path] = signature
+                ready.append(path)
+        for path in list(self._pending):
+            if path not in files:
+                del self._pending[path]
+        return ready
+
+
+async def watch(
+    watcher,
+    convert,
+    executor,
+    workers=1,
+    interval=DEFAULT_INTERVAL,
+    on_result=None,
+    stop=None,
+    maintain=None,
+):
+    """
+    Converts the files reported by watcher until stop (an asyncio.Event)
+    is set. convert(path) runs on executor, off the event loop, and must
+    return (output_file, error, ...) like main.convert_one; up to workers
+    files are converted at a time. on_result(path, output_file, error) is
+    called for every finished file. maintain(), e.g. a cache eviction, runs
+    in a thread between scans whenever files were converted since its last
+    call.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop = stop or asyncio.Event()
+    finished = 0
+
+    async def scan():
+        maintained = 0
+        while not stop.is_set():
+            for path in watcher.poll():
+                logger.info("Queued '%s'", path)
+                queue.put_nowait(path)
+            if maintain is not None and finished != maintained:
+                maintained = finished
+                try:
+                    await loop.run_in_executor(None, maintain)
+                except Exception as e:
+                    logger.warning("Maintenance failed: %s", e)
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def work():
+        nonlocal finished
+        while True:
+            path = await queue.get()
+            try:
+                result = await loop.run_in_executor(executor, convert, path)
+                output_file, error = result[:2]
+            except Exception as e:
+                output_file, error = None, f"Unexpected error: {e}"
+            finally:
+                queue.task_done()
+                finished += 1
+            if on_result is not None:
+                on_result(path, output_file, error)
+
+    tasks = [asyncio.create_task(work()) for _ in range(workers)]
+    try:
+        await scan()
+        # Finish what was already queued before stopping
+        await queue.join()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def serve(watcher, convert, executor, workers=1, **kwargs):
+    """
+    Runs watch until SIGINT or SIGTERM, then finishes the queued files.
+    """
+    import asyncio
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Not available on Windows; Ctrl+C then stops the loop at once
+            pass
+    await watch(watcher, convert, executor, workers, stop=stop, **kwargs)
+
+
+def ignore_interrupts():
+    """
+    Worker process initializer: lets the daemon handle Ctrl+C, so that
+    conversions in progress are not interrupted.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
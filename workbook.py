@@ -0,0 +1,212 @@
+import datetime
+import os
+
+import pandas as pd
+
+import timings
+from columnar import frame_with_header, header_names
+from engines import choose_engine
+from fast_detector import read_sheet_names
+
+
+class Workbook:
+    """
+    An input statement that is parsed at most once and shared between
+    structure detection and the processors.
+    With streaming=True the sheet is never loaded as a whole; rows are
+    read one by one with rows() instead.
+    engine names the Excel parsing engine (see engines.py); by default
+    the fastest one installed for the file type is used.
+    sheet names the sheet to read; by default it is the first one.
+    Raises ValueError when the given engine cannot read the file.
+    """
+
+    def __init__(self, path, streaming=False, engine=None, sheet=None):
+        self.path = path
+        self.streaming = streaming
+        self.engine = choose_engine(path, engine, streaming)
+        self.sheet_name = sheet
+        self._sheet = None
+
+    def _read_excel(self, **kwargs):
+        sheet_name = 0 if self.sheet_name is None else self.sheet_name
+        return pd.read_excel(
+            self.path, sheet_name=sheet_name, engine=self.engine, **kwargs
+        )
+
+    @property
+    def sheet(self):
+        """
+        The sheet read with header=None, parsed on first access.
+        Cells keep their Python values (dtype=object): every column mixes
+        header text with data, so inferring column types would be wasted.
+        """
+        if self._sheet is None:
+            with timings.stage("read_excel"):
+                self._sheet = self._read_excel(header=None, dtype=object)
+            timings.add_rows("read_excel", len(self._sheet))
+        return self._sheet
+
+    def frame(self, header_idx, columns):
+        """
+        Returns the rows below row header_idx as a data frame with only the
+        given columns, a dict mapping column names to dtypes; columns the
+        sheet does not have are left out.
+        Unless the sheet is already parsed, only these columns are read,
+        with their dtypes, instead of parsing and type-inferring all of them.
+        """
+        if self._sheet is not None:
+            return frame_with_header(self._sheet, header_idx, columns)
+        with timings.stage("read_excel"):
+            df = self._read_excel(
+                header=header_idx,
+                usecols=lambda name: name in columns,
+                dtype=columns,
+            )
+        timings.add_rows("read_excel", len(df))
+        return df
+
+    def rows(self):
+        """
+        Iterates over the rows of the sheet as lists of cell values.
+        """
+        rows = iter_rows(self.path, self.engine, self.sheet_name)
+        return timings.timed_iter(rows, "read_rows")
+
+    def first_row(self):
+        """
+        Returns the cell values of the first row, or an empty list.
+        """
+        if self.streaming:
+            return next(self.rows(), [])
+        if self.sheet.empty:
+            return []
+        return self.sheet.iloc[0].tolist()
+
+
+def open_workbook(source, engine=None):
+    """
+    Returns source unchanged if it is already a Workbook,
+    otherwise wraps the given file path into one.
+    """
+    if isinstance(source, Workbook):
+        return source
+    return Workbook(source, engine=engine)
+
+
+def sheet_names(path, engine=None):
+    """
+    Returns the names of the sheets of a workbook in order. They are read
+    without loading any sheet when possible.
+    """
+    names = read_sheet_names(path)
+    if names is None:
+        with pd.ExcelFile(path, engine=choose_engine(path, engine)) as book:
+            names = book.sheet_names
+    return names
+
+
+def iter_rows(path, engine=None, sheet=None):
+    """
+    Lazily yields the rows of the first sheet, or of the sheet named
+    sheet, as lists of cell values,
+    converted the way read_excel converts them: empty cells become NaN
+    and whole-number floats become ints.
+    XLSX files are streamed with openpyxl in read-only mode, so memory
+    stays flat regardless of the number of rows. For XLS files xlrd
+    loads the sheet on demand, which the format limits to 65536 rows.
+    With engine='calamine' the sheet is loaded by calamine, which is
+    faster but keeps all cells in memory.
+    """
+    if engine is None:
+        engine = "xlrd" if os.path.splitext(path)[1].lower() == ".xls" else "openpyxl"
+    if engine == "calamine":
+        return _iter_calamine_rows(path, sheet)
+    if engine == "xlrd":
+        return _iter_xls_rows(path, sheet)
+    return _iter_xlsx_rows(path, sheet)
+
+
+def _convert_cell(value):
+    if value is None or value == "":
+        return float("nan")
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _iter_calamine_rows(path, name=None):
+    from python_calamine import CalamineWorkbook
+
+    wb = CalamineWorkbook.from_path(path)
+    try:
+        if name is None:
+            sheet = wb.get_sheet_by_index(0)
+        else:
+            sheet = wb.get_sheet_by_name(name)
+        # iter_rows starts at the first non-empty cell; pad like the
+        # other readers, which start at A1
+        first_row, first_col = sheet.start or (0, 0)
+        for _ in range(first_row):
+            yield []
+        padding = [float("nan")] * first_col
+        for values in sheet.iter_rows():
+            yield padding + [_convert_calamine_cell(value) for value in values]
+    finally:
+        wb.close()
+
+
+def _convert_calamine_cell(value):
+    # Date-only cells become datetimes, as read_excel does for all engines
+    if type(value) is datetime.date:
+        return datetime.datetime(value.year, value.month, value.day)
+    return _convert_cell(value)
+
+
+def _iter_xlsx_rows(path, name=None):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0] if name is None else wb[name]
+        for values in ws.iter_rows(values_only=True):
+            yield [_convert_cell(value) for value in values]
+    finally:
+        wb.close()
+
+
+def _iter_xls_rows(path, name=None):
+    import xlrd
+
+    book = xlrd.open_workbook(path, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0) if name is None else book.sheet_by_name(name)
+        for r in range(sheet.nrows):
+            row = []
+            for cell in sheet.row(r):
+                if cell.ctype == xlrd.XL_CELL_DATE:
+                    value = xlrd.xldate.xldate_as_datetime(cell.value, book.datemode)
+                elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                    value = bool(cell.value)
+                elif cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+                    value = None
+                elif cell.ctype == xlrd.XL_CELL_ERROR:
+                    value = None
+                else:
+                    value = cell.value
+                row.append(_convert_cell(value))
+            yield row
+    finally:
+        book.release_resources()
+
+
+def iter_mapped_rows(rows, header):
+    """
+    Yields the remaining rows as dicts keyed by the column names built
+    from the header row, padding short rows with NaN.
+    """
+    columns = header_names(header)
+    for values in rows:
+        if len(values) < len(columns):
+            values = values + [float("nan")] * (len(columns) - len(values))
+        yield dict(zip(columns, values))